@@ -0,0 +1,44 @@
+from typing import List
+
+import orjson
+from aiohttp import web
+
+from ._issues import make_pages
+
+
+class GitHubStub:
+    """
+    Local stub of the GitHub issues API, serving pre-encoded pages of synthetic issues.
+
+    Pages are numbered from 1 like the GitHub API, a page past the last one is an empty list.
+    """
+
+    def __init__(self, count: int, per_page: int = 100) -> None:
+        """
+        :param count: Total number of issues.
+        :param per_page: Number of issues per page.
+        """
+        self.pages: List[list] = make_pages(count, per_page)
+        self.bodies: List[bytes] = [orjson.dumps(page) for page in self.pages]
+        self.requests = 0
+        self._runner: web.AppRunner = None  # type: ignore
+        self.url = ""
+
+    async def _issues(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        page = int(request.query.get("page", 1))
+        body = self.bodies[page - 1] if 0 < page <= len(self.bodies) else b"[]"
+        return web.Response(body=body, content_type="application/json")
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/repos/{owner}/{repo}/issues", self._issues)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.url = f"http://127.0.0.1:{port}"
+
+    async def stop(self) -> None:
+        await self._runner.cleanup()
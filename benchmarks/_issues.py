@@ -0,0 +1,47 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+BODY_HTML = (
+    "<h3>Summary</h3><p>Implement the feature #{number} for the TON ecosystem with documentation and tests.</p>"
+    "<h3>Context</h3><p>{context}</p>"
+    "<h3>Goals</h3><ul><li>Deliver the implementation.</li><li>Write the documentation.</li></ul>"
+    "<h3>Reward</h3><ul><li>{reward} USD in TON</li><li>SBT</li></ul>"
+)
+CONTEXT = " ".join(["The bounty requires knowledge of smart contracts and the TON SDK."] * 8)
+STARTED_AT = datetime(2023, 1, 1, tzinfo=timezone.utc)
+
+
+def make_issue(number: int) -> Dict[str, Any]:
+    """
+    Builds a synthetic issue as returned by the GitHub API.
+
+    :param number: Issue number, the other fields are derived from it.
+    """
+    created_at = STARTED_AT + timedelta(hours=number)
+    closed = number % 3 == 0
+    return {
+        "number": number,
+        "html_url": f"https://github.com/ton-society/grants-and-bounties/issues/{number}",
+        "title": f"Bounty #{number}",
+        "user": {"login": f"creator{number % 50}"},
+        "assignee": {"login": f"assignee{number % 20}"} if number % 2 else None,
+        "assignees": [{"login": f"assignee{number % 20}"}] if number % 2 else [],
+        "labels": [{"name": "Approved"}, {"name": "Developer Tool"}] if number % 4 else [{"name": "Bounty"}],
+        "body_html": BODY_HTML.format(number=number, context=CONTEXT, reward=100 + number % 900),
+        "state": "closed" if closed else "open",
+        "state_reason": "completed" if closed else None,
+        "created_at": created_at.isoformat(),
+        "updated_at": (created_at + timedelta(days=1)).isoformat(),
+        "closed_at": (created_at + timedelta(days=7)).isoformat() if closed else None,
+    }
+
+
+def make_pages(count: int, per_page: int = 100) -> List[List[Dict[str, Any]]]:
+    """
+    Builds pages of synthetic issues, newest first like the GitHub API with direction=desc.
+
+    :param count: Total number of issues.
+    :param per_page: Number of issues per page.
+    """
+    numbers = range(count, 0, -1)
+    return [[make_issue(n) for n in numbers[i:i + per_page]] for i in range(0, count, per_page)]
@@ -0,0 +1,110 @@
+import asyncio
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable
+
+import orjson
+from aiogram.client.telegram import TelegramAPIServer
+from aiohttp import web
+
+# Bot API methods implemented by the stub
+METHODS = ("sendMessage", "sendPhoto", "sendDocument", "editMessageText", "deleteMessage")
+
+
+class TelegramStub:
+    """
+    Local stub of the Telegram Bot API, point a `Bot` at it with `AiohttpSession(api=stub.api)`.
+
+    Every request is answered after `latency` seconds. Every `retry_every`-th request is answered
+    with a 429 error and `retry_after` seconds to wait, the chats in `blocked` answer with a 403
+    "bot was blocked by the user" error. Successful sends are counted per chat in `delivered`,
+    the bytes of the uploaded files in `uploaded`.
+    """
+
+    def __init__(
+            self,
+            latency: float = 0.0,
+            retry_every: int = 0,
+            retry_after: int = 1,
+            blocked: Iterable[int] = (),
+    ) -> None:
+        """
+        :param latency: Response time of the stub in seconds.
+        :param retry_every: Answer every N-th request with a 429 error, 0 to disable.
+        :param retry_after: Seconds to wait after a 429 error.
+        :param blocked: IDs of the chats that blocked the bot.
+        """
+        self.latency = latency
+        self.retry_every = retry_every
+        self.retry_after = retry_after
+        self.blocked = set(blocked)
+        self.requests: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.delivered: Counter = Counter()
+        self.uploaded = 0
+        self._message_id = 0
+        self._runner: web.AppRunner = None  # type: ignore
+        self.url = ""
+
+    @property
+    def api(self) -> TelegramAPIServer:
+        return TelegramAPIServer.from_base(self.url)
+
+    @staticmethod
+    def _error(code: int, description: str, **parameters: Any) -> web.Response:
+        result = {"ok": False, "error_code": code, "description": description}
+        if parameters:
+            result["parameters"] = parameters
+        return web.Response(status=code, body=orjson.dumps(result), content_type="application/json")
+
+    def _message(self, method: str, chat_id: int) -> Dict[str, Any]:
+        self._message_id += 1
+        message = {"message_id": self._message_id, "date": int(time.time()), "chat": {"id": chat_id, "type": "private"}}
+        file = {"file_id": f"file-{self._message_id}", "file_unique_id": f"unique-{self._message_id}"}
+        if method == "sendPhoto":
+            message["photo"] = [{**file, "width": 1280, "height": 720}]
+        elif method == "sendDocument":
+            message["document"] = file
+        return message
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        data = await request.post()
+        self.requests[method] += 1
+        for value in data.values():
+            if isinstance(value, web.FileField):
+                self.uploaded += len(value.file.read())
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if method not in METHODS:
+            return self._error(404, "Not Found: method not found")
+        if self.retry_every and sum(self.requests.values()) % self.retry_every == 0:
+            self.errors["retry_after"] += 1
+            return self._error(429, f"Too Many Requests: retry after {self.retry_after}",
+                               retry_after=self.retry_after)
+        chat_id = int(data["chat_id"])
+        if chat_id in self.blocked:
+            self.errors["blocked"] += 1
+            return self._error(403, "Forbidden: bot was blocked by the user")
+
+        if method == "deleteMessage":
+            result = True
+        else:
+            result = self._message(method, chat_id)
+            if method != "editMessageText":
+                self.delivered[chat_id] += 1
+        return web.Response(body=orjson.dumps({"ok": True, "result": result}), content_type="application/json")
+
+    async def start(self) -> None:
+        app = web.Application(client_max_size=20 * 1024 ** 2)
+        app.router.add_post("/bot{token}/{method}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.url = f"http://127.0.0.1:{port}"
+
+    async def stop(self) -> None:
+        await self._runner.cleanup()
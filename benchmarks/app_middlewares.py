@@ -0,0 +1,72 @@
+"""
+Throughput benchmark of the app middlewares on a webhook-like route.
+
+Posts a Telegram update to a FastAPI route that accepts it as a dict, with the previous
+stack of four BaseHTTPMiddleware subclasses and with the single pure ASGI StateMiddleware.
+
+Usage:
+    python -m benchmarks.app_middlewares
+"""
+import asyncio
+import json
+
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import Response
+
+from project.app.middlewares import StateMiddleware
+from ._asgi import measure_requests
+
+ROUNDS = 5_000
+UPDATE = json.dumps(
+    {
+        "update_id": 1,
+        "message": {
+            "message_id": 1, "date": 0, "text": "/start",
+            "chat": {"id": 1, "type": "private", "first_name": "A"},
+            "from": {"id": 1, "is_bot": False, "first_name": "A"},
+        },
+    }
+).encode()
+
+
+class AttributeMiddleware(BaseHTTPMiddleware):
+    """Equivalent of each of the previous middlewares: sets one attribute on the request state."""
+
+    def __init__(self, name: str, value: object, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.name, self.value = name, value
+
+    async def dispatch(self, request, call_next) -> Response:
+        setattr(request.state, self.name, self.value)
+        return await call_next(request)
+
+
+async def webhook(update: dict) -> Response:  # noqa
+    return Response()
+
+
+def make_app(previous: bool) -> FastAPI:
+    app = FastAPI()
+    app.add_api_route("/bot", endpoint=webhook, methods=["POST"])
+    state = {"bot": object(), "config": object(), "sessionmaker": object(), "scheduler": object()}
+    if previous:
+        for name, value in state.items():
+            app.add_middleware(AttributeMiddleware, name=name, value=value)  # type: ignore
+    else:
+        app.add_middleware(StateMiddleware, **state)  # type: ignore
+    return app
+
+
+async def measure(app: FastAPI) -> float:
+    headers = [(b"content-type", b"application/json")]
+    return 1 / await measure_requests(app, "POST", "/bot", ROUNDS, UPDATE, headers)
+
+
+async def main() -> None:
+    for name, previous in {"previous": True, "current": False}.items():
+        print(f"{name:>10}: {await measure(make_app(previous)):10.0f} requests/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
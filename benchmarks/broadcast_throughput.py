@@ -0,0 +1,187 @@
+"""
+Benchmark of the broadcast throughput and correctness, against a local stub of the Telegram Bot API
+and a SQLite database standing in for MySQL.
+
+For each audience size, 90% private chats and 10% groups and channels with 1% of them having
+blocked the bot, measures:
+
+- send_message: `send_message` of a text to every chat, one by one;
+- weekly_digest: the `weekly_update_digest` job;
+- newsletter: `NewsletterView.run_newsletter` of a newsletter with an image and buttons.
+
+The stub answers after --latency seconds and every --retry-every-th request with a 429 error.
+With --preview-photos the weekly digest preview is sent as a photo instead of a hidden link.
+A broadcast is correct if every chat that didn't block the bot received the message exactly once.
+Requires the packages of benchmarks/requirements.txt.
+
+Usage:
+    python -m benchmarks.broadcast_throughput [--sizes 1000 10000 100000] [--latency 0.02] [--retry-every 500]
+        [--preview-photos]
+"""
+import argparse
+import asyncio
+import io
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import Awaitable, Callable, Dict, List, Set
+
+from aiogram import Bot
+from aiogram.client.default import DefaultBotProperties
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.enums import ChatMemberStatus, ParseMode
+from fakeredis import FakeAsyncRedis
+from libcloud.storage.providers import get_driver
+from libcloud.storage.types import Provider
+from PIL import Image
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy_file import File
+from sqlalchemy_file.storage import StorageManager
+from sulguk import AiogramSulgukMiddleware
+
+from project.admin.views.newsletter import NewsletterView
+from project.bot.utils.messages import send_message
+from project.bot.utils.texts.messages import MessageCode
+from project.db.models import Base, ChatDB, NewsletterDB, TextMessageDB, UserDB
+from project.scheduler.tasks.weekly_update_digest import weekly_update_digest
+from ._telegram_stub import TelegramStub
+
+SIZES = [1_000]
+TEXT = "<p><b>Weekly digest</b></p><p>Active bounties: {active}</p>"
+DIGEST_TEXT = "<p><b>Weekly digest</b></p><p>Active bounties: {num_active}</p>"
+
+
+def make_image() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (1280, 720), (0, 136, 204)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+async def populate(sessionmaker: async_sessionmaker, size: int) -> Set[int]:
+    """
+    Creates the audience: every 10th chat is a group or a channel, the others are users.
+
+    :return: IDs of the chats that blocked the bot.
+    """
+    blocked = set()
+    async with sessionmaker() as session:
+        for index in range(size):
+            if index % 10 == 0:
+                chat_id = -1_000_000_000_000 - index
+                chat_type = "channel" if index % 20 == 0 else "supergroup"
+                session.add(ChatDB(id=chat_id, broadcast=True, type=chat_type, title=f"Chat {index}"))
+            else:
+                chat_id = index
+                session.add(UserDB(id=chat_id, broadcast=True, state=ChatMemberStatus.MEMBER,
+                                   full_name=f"User {index}"))
+            if index % 100 == 7:
+                blocked.add(chat_id)
+        session.add(TextMessageDB(
+            code=MessageCode.WEEKLY_DIGEST,
+            text=DIGEST_TEXT,
+            preview_url="https://telegra.ph/file/weekly-digest.png",
+        ))
+        session.add(NewsletterDB(
+            image=File(content=make_image(), filename="newsletter.png", content_type="image/png"),
+            content="<p><b>Newsletter</b></p><p>Active bounties: {active}</p>",
+            buttons=[{"text": "Bounties", "url": "https://github.com/ton-society/grants-and-bounties"}],
+            chat_type="all",
+            job_id="benchmark",
+        ))
+        await session.commit()
+    return blocked
+
+
+async def run_size(
+        stub: TelegramStub,
+        sessionmaker: async_sessionmaker,
+        size: int,
+) -> Dict[str, Dict[str, float]]:
+    async with sessionmaker() as session:
+        for table in reversed(Base.metadata.sorted_tables):
+            await session.execute(table.delete())
+        await session.commit()
+    stub.blocked = await populate(sessionmaker, size)
+    chat_ids: List[int] = [chat_id async for chat_id in ChatDB.iter_all_ids(sessionmaker)]
+    newsletter = await NewsletterDB.get_by_job_id(sessionmaker, "benchmark")
+    bot: Bot = asyncio.get_running_loop().__getattribute__("bot")
+
+    async def send_all() -> None:
+        for chat_id in chat_ids:
+            await send_message(bot, chat_id, TEXT)
+
+    stages: Dict[str, Callable[[], Awaitable]] = {
+        "send_message": send_all,
+        "weekly_digest": weekly_update_digest,
+        "newsletter": lambda: NewsletterView.run_newsletter(newsletter.id),
+    }
+    expected = set(chat_ids) - stub.blocked
+    results = {}
+    for stage, run in stages.items():
+        stub.requests.clear(), stub.errors.clear(), stub.delivered.clear()
+        stub.uploaded = 0
+        started = time.perf_counter()
+        await run()
+        seconds = time.perf_counter() - started
+        delivered = set(stub.delivered)
+        results[stage] = {
+            "seconds": seconds,
+            "sent_per_second": sum(stub.delivered.values()) / seconds,
+            "missing": len(expected - delivered),
+            "duplicates": sum(count - 1 for count in stub.delivered.values()),
+            "retry_after": stub.errors["retry_after"],
+            "blocked": stub.errors["blocked"],
+            "uploaded_kb": stub.uploaded / 1024,
+        }
+    return results
+
+
+def report(results: Dict[int, Dict[str, Dict[str, float]]]) -> None:
+    print(f"{'chats':>8} {'stage':>14} {'seconds':>9} {'sent/s':>8} {'missing':>8} {'dups':>6} {'429s':>6} {'403s':>6} {'upload KB':>10}")
+    for size, stages in results.items():
+        for stage, r in stages.items():
+            print(f"{size:>8} {stage:>14} {r['seconds']:9.2f} {r['sent_per_second']:8.1f} {r['missing']:>8} "
+                  f"{r['duplicates']:>6} {r['retry_after']:>6} {r['blocked']:>6} {r['uploaded_kb']:10.1f}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark of the broadcast throughput and correctness.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="audience sizes in chats")
+    parser.add_argument("--latency", type=float, default=0.02, help="response time of the Bot API stub")
+    parser.add_argument("--retry-every", type=int, default=500, help="answer every N-th request with a 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="seconds to wait after a 429")
+    parser.add_argument("--preview-photos", action="store_true", help="send the previews as photos")
+    args = parser.parse_args()
+
+    stub = TelegramStub(latency=args.latency, retry_every=args.retry_every, retry_after=args.retry_after)
+    await stub.start()
+    bot = Bot(
+        token="123456:benchmark",
+        session=AiohttpSession(api=stub.api),
+        default=DefaultBotProperties(parse_mode=ParseMode.HTML),
+    )
+    bot.session.middleware(AiogramSulgukMiddleware())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        StorageManager.add_storage("image", get_driver(Provider.LOCAL)(tmp).create_container("img"))
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp}/broadcast.db")
+        sessionmaker = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+        loop = asyncio.get_running_loop()
+        loop.__setattr__("bot", bot)
+        loop.__setattr__("config", SimpleNamespace(bot=SimpleNamespace(PREVIEW_PHOTOS=args.preview_photos)))
+        loop.__setattr__("redis", FakeAsyncRedis())
+        loop.__setattr__("sessionmaker", sessionmaker)
+
+        try:
+            report({size: await run_size(stub, sessionmaker, size) for size in args.sizes})
+        finally:
+            await engine.dispose()
+            await bot.session.close()
+            await stub.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,63 @@
+"""
+Benchmark of the GitHub issues parsing, using synthetic issue pages.
+
+Parses the pages inline on the event loop (the previous path) and through the process pool
+of `GitHubAPI` (the current path), while a ticker measures the event loop lag: the delay
+of a 1 ms sleep is what every webhook request waits in addition to its own work.
+
+Usage:
+    python -m benchmarks.issue_parsing
+"""
+import asyncio
+import time
+from typing import Awaitable, Callable, List
+
+from project.apis.github import GitHubAPI
+from project.apis.github.api import parse_issues
+from ._issues import make_pages
+
+ISSUES = 2_000
+TICK = 0.001
+
+
+async def measure_lag(parse: Callable[[list], Awaitable[list]], pages: List[list]) -> None:
+    lags, done = [], False
+
+    async def ticker() -> None:
+        while not done:
+            started = time.perf_counter()
+            await asyncio.sleep(TICK)
+            lags.append(time.perf_counter() - started - TICK)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    for issues in await asyncio.gather(*(parse(page) for page in pages)):
+        assert issues
+    elapsed = time.perf_counter() - started
+    done = True
+    await task
+
+    lags.sort()
+    p99 = lags[int(len(lags) * 0.99) - 1] if lags else 0.0
+    print(f"{ISSUES / elapsed:8.0f} issues/s, loop lag p99 {p99 * 1000:8.1f} ms, max {lags[-1] * 1000:8.1f} ms")
+
+
+async def main() -> None:
+    pages = make_pages(ISSUES)
+
+    async def inline(page: list) -> list:
+        return parse_issues(page)
+
+    print("inline      :", end=" ")
+    await measure_lag(inline, pages)
+
+    githubapi = GitHubAPI(token="benchmark", owner="ton-society", repo="grants-and-bounties")
+    await githubapi._parse_issues(pages[0])  # noqa, start the pool processes
+    print("process pool:", end=" ")
+    await measure_lag(githubapi._parse_issues, pages)  # noqa
+    githubapi.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,89 @@
+"""
+Benchmark of the society top storage: JSON path vs memory-mapped binary path.
+
+Measures cold (first read after a restart) and warm page reads of the top contributors
+at 10k and 100k users, and peak Python memory allocated by a cold read.
+
+Usage:
+    python -m benchmarks.society_storage
+"""
+import asyncio
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Awaitable, Tuple
+
+from project.apis.society.models import User
+from project.apis.society.storage import SocietyStorage
+
+SIZES = [10_000, 100_000]
+PAGE_SIZE = 15
+WARM_ROUNDS = 1_000
+
+
+def make_users(count: int) -> list[User]:
+    return [
+        User(id=str(i), name=f"Contributor {i}", username=f"contributor_{i}", awards_count=count - i)
+        for i in range(count)
+    ]
+
+
+def reset_caches() -> None:
+    """Drops in-memory caches to simulate a process restart."""
+    for _, reader in SocietyStorage._readers.values():  # noqa
+        reader.close()
+    SocietyStorage._readers.clear()  # noqa
+    SocietyStorage._cache.clear()  # noqa
+
+
+async def measure_cold(read: Callable[[], Awaitable]) -> Tuple[float, float]:
+    reset_caches()
+    tracemalloc.start()
+    started = time.perf_counter()
+    await read()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed * 1000, peak / 1024 / 1024
+
+
+async def measure_warm(read: Callable[[], Awaitable]) -> float:
+    await read()
+    started = time.perf_counter()
+    for _ in range(WARM_ROUNDS):
+        await read()
+    return (time.perf_counter() - started) / WARM_ROUNDS * 1_000_000
+
+
+async def main() -> None:
+    print(f"{'users':>8} {'path':>7} {'cold ms':>10} {'cold MiB':>10} {'warm us/page':>14}")
+
+    for size in SIZES:
+        with tempfile.TemporaryDirectory() as tmp:
+            storage = SocietyStorage(
+                filename=f"{tmp}/top.json",
+                binary_filename=f"{tmp}/top.bin",
+                state_filename=f"{tmp}/state.json",
+            )
+            await storage.save_users(make_users(size))
+            middle_page = size // PAGE_SIZE // 2
+
+            # JSON path: load and validate the whole top, then slice a page
+            json_storage = SocietyStorage(filename=storage.filename, binary_filename=f"{tmp}/missing.bin")
+            results = {
+                "json": json_storage,
+                "binary": storage,
+            }
+            for name, target in results.items():
+                async def read():
+                    return await target.get_page(middle_page, PAGE_SIZE)
+
+                cold_ms, cold_mib = await measure_cold(read)
+                warm_us = await measure_warm(read)
+                print(f"{size:>8} {name:>7} {cold_ms:>10.2f} {cold_mib:>10.2f} {warm_us:>14.2f}")
+
+            reset_caches()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
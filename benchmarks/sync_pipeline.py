@@ -0,0 +1,149 @@
+"""
+Benchmark of the GitHub issues sync pipeline, replaying synthetic repositories through a local
+stub of the GitHub API and a SQLite database standing in for MySQL.
+
+Measures, for each repository size:
+
+- fetch_parse: `GitHubAPI.get_issues_all` end-to-end against the stub (HTTP, JSON, process pool);
+- parse: `Issue` parsing of all pages inline, on one core;
+- categorize: `_categorize` against a database snapshot where 1% of the issues are new
+  and 5% were approved since;
+- upsert: `IssueDB.update_all` into the SQLite snapshot;
+- render: notification rendering (`format_issue_notify_to_message` and the sulguk transform)
+  of every issue.
+
+Results are compared with the stored baseline (benchmarks/baselines/sync_pipeline.json),
+`--save` replaces the baseline. Requires the packages of benchmarks/requirements.txt.
+
+Usage:
+    python -m benchmarks.sync_pipeline [--sizes 1000 10000 50000] [--save]
+"""
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List
+
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sulguk import transform_html
+
+from project.apis.github import GitHubAPI
+from project.apis.github.api import parse_issues
+from project.apis.github.models import Issue
+from project.bot.utils.formatters import format_issue_notify_to_message
+from project.db.models import Base, IssueDB
+from project.scheduler.tasks.track_and_notify import _categorize  # noqa
+from ._github_stub import GitHubStub
+
+SIZES = [1_000, 10_000]
+BASELINE = Path(__file__).parent / "baselines" / "sync_pipeline.json"
+MESSAGE_TEXT = "<p>{title}</p>\r\n<p>{labels}</p>\r\n<p>{summary}</p>\r\n<p>{rewards}</p>"
+
+
+def make_snapshot(issues: List[Issue]) -> List[IssueDB]:
+    """
+    Builds the database state of the previous sync: 1% of the issues don't exist yet,
+    5% of the open ones were not approved yet.
+    """
+    snapshot = []
+    for issue in issues:
+        if issue.number % 100 == 0:
+            continue
+        data = issue.model_dump()
+        for key in ("created_at", "updated_at", "closed_at"):
+            data[key] = data[key].replace(tzinfo=None) if data[key] else None
+        if issue.number % 20 == 2 and "Approved" in issue.labels:
+            data["labels"] = [label for label in issue.labels if label != "Approved"]
+            data["assignee"], data["assignees"] = None, []
+        snapshot.append(IssueDB(**data))
+    return snapshot
+
+
+async def measure(stage: Callable[[], Awaitable]) -> float:
+    started = time.perf_counter()
+    await stage()
+    return time.perf_counter() - started
+
+
+async def run_size(size: int) -> Dict[str, float]:
+    results = {}
+    stub = GitHubStub(size)
+    await stub.start()
+    githubapi = GitHubAPI(token="benchmark", owner="ton-society", repo="grants-and-bounties", base_url=stub.url)
+    issues: List[Issue] = []
+
+    async def fetch_parse() -> None:
+        issues.extend(await githubapi.get_issues_all("all"))
+
+    await githubapi._parse_issues(stub.pages[0])  # noqa, start the pool processes
+    results["fetch_parse"] = await measure(fetch_parse)
+    githubapi.close()
+    await stub.stop()
+    assert len(issues) == size, f"{len(issues)} issues fetched, {size} expected"
+
+    async def parse() -> None:
+        for page in stub.pages:
+            parse_issues(page)
+
+    results["parse"] = await measure(parse)
+
+    snapshot = make_snapshot(issues)
+
+    async def categorize() -> None:
+        created, _, approved, _ = await _categorize(snapshot, issues)
+        assert created and approved
+
+    results["categorize"] = await measure(categorize)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp}/issues.db")
+        sessionmaker = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        async with sessionmaker() as session:
+            session.add_all(make_snapshot(issues))
+            await session.commit()
+
+        async def upsert() -> None:
+            await IssueDB.update_all(sessionmaker, issues)
+
+        results["upsert"] = await measure(upsert)
+        await engine.dispose()
+
+    async def render() -> None:
+        for issue in issues:
+            transform_html(format_issue_notify_to_message(MESSAGE_TEXT, issue))
+
+    results["render"] = await measure(render)
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]]) -> None:
+    print(f"{'issues':>8} {'stage':>12} {'seconds':>10} {'baseline':>10} {'change':>8}")
+    for size, stages in results.items():
+        for stage, seconds in stages.items():
+            base = baseline.get(size, {}).get(stage)
+            change = f"{(seconds - base) / base * 100:+7.1f}%" if base else "       -"
+            base = f"{base:10.3f}" if base else f"{'-':>10}"
+            print(f"{size:>8} {stage:>12} {seconds:10.3f} {base} {change}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark of the GitHub issues sync pipeline.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="repository sizes in issues")
+    parser.add_argument("--save", action="store_true", help="save the results as the baseline")
+    args = parser.parse_args()
+
+    results = {str(size): await run_size(size) for size in args.sizes}
+    baseline = json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+    compare(results, baseline)
+
+    if args.save:
+        BASELINE.write_text(json.dumps({**baseline, **results}, indent=2) + "\n")
+        print(f"Baseline saved to {BASELINE}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,81 @@
+"""
+Benchmark of the webhook update decoding, using recorded update fixtures.
+
+Measures updates/s on a single core for:
+
+- decoding: the previous path (FastAPI parses the body into a dict, then `Update(**update)`)
+  against the current one (`decode_update` on the raw body, then `Update.model_validate`);
+- the webhook endpoint: the previous `update: dict` body-model endpoint against the current
+  raw-body endpoint, both only enqueueing the update.
+
+Usage:
+    python -m benchmarks.webhook_decode
+"""
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Callable
+
+from aiogram import Bot
+from aiogram.types import Update
+from fastapi import FastAPI
+from starlette.requests import Request
+from starlette.responses import Response
+
+from project.bot.webhook import decode_update
+from ._asgi import measure_requests
+
+ROUNDS = 5_000
+FIXTURES = Path(__file__).parent / "fixtures" / "updates.json"
+BODIES = [json.dumps(update).encode() for update in json.loads(FIXTURES.read_text())]
+
+
+def measure_decode(decode: Callable[[bytes], Update]) -> float:
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        for body in BODIES:
+            decode(body)
+    return ROUNDS * len(BODIES) / (time.perf_counter() - started)
+
+
+async def previous_webhook(update: dict) -> Response:
+    return Response() if isinstance(update.get("update_id"), int) else Response(status_code=400)
+
+
+async def current_webhook(request: Request) -> Response:
+    try:
+        decode_update(await request.body())
+    except ValueError:
+        return Response(status_code=400)
+    return Response()
+
+
+async def measure_endpoint(endpoint: Callable) -> float:
+    app = FastAPI()
+    app.add_api_route("/bot", endpoint=endpoint, methods=["POST"])
+    headers = [(b"content-type", b"application/json")]
+    elapsed = 0.0
+    for body in BODIES:
+        elapsed += await measure_requests(app, "POST", "/bot", ROUNDS // len(BODIES), body, headers)
+    return len(BODIES) / elapsed
+
+
+async def main() -> None:
+    bot = Bot(token="123456:benchmark")
+    decoders = {
+        "previous": lambda body: Update(**json.loads(body)),
+        "current": lambda body: Update.model_validate(decode_update(body), context={"bot": bot}),
+    }
+    for name, decode in decoders.items():
+        print(f"decode   {name:>10}: {measure_decode(decode):10.0f} updates/s")
+
+    endpoints = {"previous": previous_webhook, "current": current_webhook}
+    for name, endpoint in endpoints.items():
+        print(f"endpoint {name:>10}: {await measure_endpoint(endpoint):10.0f} updates/s")
+
+    await bot.session.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -4,34 +4,41 @@ from contextlib import asynccontextmanager
 import uvicorn
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
+from aiogram.client.session.aiohttp import AiohttpSession
 from aiogram.enums import ParseMode
 from aiogram.fsm.storage.redis import RedisStorage
-from aiogram.types import Update
 from fastapi import FastAPI
+from prometheus_client import start_http_server
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from starlette.middleware import Middleware
 from starlette.middleware.sessions import SessionMiddleware
+from starlette.requests import Request
 from starlette.responses import Response
 from starlette.staticfiles import StaticFiles
+from starlette.status import HTTP_400_BAD_REQUEST, HTTP_503_SERVICE_UNAVAILABLE
 from starlette_admin import I18nConfig
 
 from .admin.admin import Admin
-from .admin.auth import AuthMiddleware, AuthProvider
+from .admin.auth import AuthProvider
 from .admin.views import admin_views_add
 from .admin.views.index import IndexView
+from .admin.views.newsletter import NewsletterView
 from .apis.github import GitHubAPI
 from .app.middlewares import app_middlewares_register
 from .app.routes import app_routers_include
 from .bot.commands import bot_commands_setup, bot_commands_delete
 from .bot.handlers import bot_routers_include
 from .bot.middlewares import bot_middlewares_register
+from .bot.webhook import UpdateDeduplicator, UpdateQueue, decode_update
 from .config import load_config
 from .db.models import Base
+from .db.segments import Segments
 from .db.storage import configure_storage
 from .db.writer import write_db_texts
 from .logger import setup_logger
-from .scheduler import Scheduler
-from .scheduler.tasks import update_society_top
+from .monitoring import LoopMonitor
+from .scheduler import RedisQueue, Scheduler, BROADCAST_QUEUE_KEY, ISSUE_EVENTS_QUEUE_KEY
+from .scheduler.tasks.track_and_notify import process_issue_event
 
 
 @asynccontextmanager
@@ -39,31 +46,47 @@ async def lifespan(_: FastAPI):
     """
     Async context manager for startup and shutdown lifecycle events.
 
+    - Sets up logger.
+    - Starts the event loop monitor and the metrics server (APP_METRICS_PORT, not exposed by nginx).
     - Creates database tables.
+    - Starts the update queue workers.
     - Sets up bot commands and webhook.
-    - Runs the scheduler.
-    - Update TON Society TOP.
+    - Runs the scheduler (the jobs are executed by the elected leader process only).
+    - Starts the broadcast and GitHub issue events drainers, unless the jobs are run by the worker process.
 
     Yields control during application's lifespan and performs cleanup on exit.
 
-    - Disposes all database connections.
     - Deletes bot webhook and commands.
-    - Shuts down the scheduler.
+    - Drains the update queue.
+    - Stops the broadcast and GitHub issue events drainers.
+    - Disposes all database connections.
+    - Shuts down the GitHub issues parsing pool.
+    - Stops the event loop monitor.
+    - Shuts down the scheduler and releases its leadership.
     """
+    setup_logger()
+    loop_monitor.start()
+    start_http_server(config.app.METRICS_PORT)
     loop = asyncio.get_event_loop()
     loop.__setattr__("bot", bot)
     loop.__setattr__("config", config)
     loop.__setattr__("githubapi", githubapi)
+    loop.__setattr__("redis", storage.redis)
     loop.__setattr__("sessionmaker", sessionmaker)
 
-    scheduler.run()
+    # In the "worker" mode, scheduled jobs and broadcasts are run by `python -m project.worker`
+    embedded = config.app.SCHEDULER_MODE != "worker"
+    scheduler.run(elect=embedded)
+    if embedded:
+        broadcast_queue.start(NewsletterView.run_newsletter)
+        issue_events_queue.start(process_issue_event)
     configure_storage()
 
     async with engine.begin() as connection:
         await connection.run_sync(Base.metadata.create_all)
     await write_db_texts(engine)
 
-    _ = asyncio.create_task(update_society_top())
+    update_queue.start()
     await bot_commands_setup(bot)
     await bot.set_webhook(url=webhook_url, allowed_updates=dp.resolve_used_update_types())
 
@@ -71,19 +94,39 @@ async def lifespan(_: FastAPI):
         yield
     finally:
         # Cleanup actions
-        scheduler.shutdown()
-        await engine.dispose()
+        await scheduler.shutdown()
         await bot_commands_delete(bot)
         await bot.delete_webhook()
+        await update_queue.stop()
+        await broadcast_queue.stop()
+        await issue_events_queue.stop()
+        await engine.dispose()
+        githubapi.close()
+        loop_monitor.stop()
         await bot.session.close()
 
 
-async def bot_webhook(update: dict) -> Response:
+async def bot_webhook(request: Request) -> Response:
     """
-    Bot webhook endpoint. Receives updates and feeds them to the bot dispatcher.
-    :param update: The update received from the bot webhook.
+    Bot webhook endpoint. Receives updates and enqueues them for the bot dispatcher.
+
+    Responds immediately, the updates are processed by the update queue workers.
+    Updates retried by Telegram are acknowledged without being processed again, by any process.
+    If the queue is full, responds with 503 so that Telegram retries the update later.
+    Once acknowledged, the update is processed at most once: it is lost if the process stops before.
+    :param request: The request with the update received from the bot webhook.
     """
-    await dp.feed_update(bot=bot, update=Update(**update))
+    try:
+        update = decode_update(await request.body())
+    except ValueError:
+        return Response(status_code=HTTP_400_BAD_REQUEST)
+    if not await update_deduplicator.claim(update["update_id"]):
+        return Response()
+    # The update queue is in-process, only a rejected update is retried by Telegram
+    if not update_queue.put(update):
+        await update_deduplicator.release(update["update_id"])
+        return Response(status_code=HTTP_503_SERVICE_UNAVAILABLE)
+    update_deduplicator.add(update["update_id"])
     return Response()
 
 
@@ -116,6 +159,7 @@ sessionmaker = async_sessionmaker(
 # Create bot instance
 bot = Bot(
     token=config.bot.TOKEN,
+    session=AiohttpSession(api=config.bot.api_server()),
     default=DefaultBotProperties(
         parse_mode=ParseMode.HTML,
     )
@@ -131,12 +175,40 @@ scheduler = Scheduler(
     config=config,
 )
 
+# Create event loop monitor instance
+loop_monitor = LoopMonitor()
+
+# Create broadcast and GitHub issue events queue instances
+broadcast_queue = RedisQueue(
+    redis=storage.redis,
+    key=BROADCAST_QUEUE_KEY,
+)
+issue_events_queue = RedisQueue(
+    redis=storage.redis,
+    key=ISSUE_EVENTS_QUEUE_KEY,
+)
+
+# Create audience segments instance
+segments = Segments(
+    redis=storage.redis,
+)
+
 # Create dispatcher instance
 dp = Dispatcher(
     storage=storage,
     config=config,
     githubapi=githubapi,
     scheduler=scheduler,
+    segments=segments,
+)
+
+# Create update queue and deduplicator instances
+update_queue = UpdateQueue(
+    dp=dp,
+    bot=bot,
+)
+update_deduplicator = UpdateDeduplicator(
+    redis=storage.redis,
 )
 
 # Create admin instance
@@ -152,7 +224,6 @@ admin = Admin(
     auth_provider=AuthProvider(),
     middlewares=[
         Middleware(SessionMiddleware, secret_key=config.webhook.SECRET),  # type: ignore
-        Middleware(AuthMiddleware, provider=AuthProvider()),  # type: ignore
     ],
     index_view=IndexView(name="index", label="Home", icon="fa fa-home"),
 )
@@ -160,14 +231,16 @@ admin = Admin(
 # Mount static files directory
 app.mount("/static", name="statics", app=StaticFiles(directory=config.admin.STATICS_DIR))
 # Register app middlewares
-app_middlewares_register(app, bot=bot, config=config, sessionmaker=sessionmaker, scheduler=scheduler)
+app_middlewares_register(app, bot=bot, config=config, sessionmaker=sessionmaker, scheduler=scheduler,
+                        broadcasts=broadcast_queue, issue_events=issue_events_queue, segments=segments)
 # Include app routes
 app_routers_include(app)
 # Register bot webhook
 app.add_api_route(webhook_path, endpoint=bot_webhook, methods=["POST"])
 
 # Register bot middlewares
-bot_middlewares_register(dp, bot, config=config, redis=storage.redis, sessionmaker=sessionmaker)
+bot_middlewares_register(dp, bot, config=config, redis=storage.redis, sessionmaker=sessionmaker,
+                         segments=segments)
 # Include bot routers
 bot_routers_include(dp)
 
@@ -177,8 +250,6 @@ admin.mount_to(app)
 admin_views_add(admin)
 
 if __name__ == '__main__':
-    # Set up logger
-    setup_logger()
     # Run app with uvicorn
     uvicorn.run(
         app,
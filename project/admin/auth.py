@@ -1,16 +1,19 @@
 # https://github.com/jowilf/starlette-admin/tree/main/examples/auth
-import asyncio
 import hashlib
 import hmac
 
 from dataclasses import dataclass, asdict
-from typing import Optional, Union
+from typing import Optional
 
-from starlette.applications import Starlette
+from cachetools import LRUCache
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from starlette._utils import get_route_path  # noqa
+from starlette.middleware import Middleware
 from starlette.middleware.base import RequestResponseEndpoint
 from starlette.requests import Request
 from starlette.responses import Response, RedirectResponse
-from starlette.routing import Route, Match, Mount, WebSocketRoute
+from starlette.routing import BaseRoute, Match
+from starlette.types import Scope
 from starlette.status import HTTP_303_SEE_OTHER
 from starlette_admin import BaseAdmin
 from starlette_admin.auth import AdminUser as BaseAdminUser
@@ -19,9 +22,12 @@ from starlette_admin.auth import AuthMiddleware as BaseAuthMiddleware
 from starlette_admin.exceptions import LoginFailed
 
 from project.config import Config
-from project.db.models import AdminDB
+from project.admin.cache import admin_roles_cache
 from project.admin.views import AdminRoles
 
+# Number of (method, path) pairs whose login requirement is cached
+LOOKUP_SIZE = 1024
+
 
 def pop_none(data: dict) -> dict:
     """
@@ -142,11 +148,7 @@ class AuthProvider(BaseAuthProvider):
         auth_data = OAuthData(**data)
         config: Config = request.state.config
 
-        if auth_data.id in [config.bot.ADMIN_ID, config.bot.DEV_ID]:
-            roles = AdminRoles.all()
-        else:
-            admin = await AdminDB.get_by_user_id(request.state.sessionmaker, auth_data.id)
-            roles = admin.roles if admin else None
+        roles = await self.get_roles(config, request.state.sessionmaker, auth_data.id)
 
         if roles and is_data_authentic(auth_data.to_dict(), config.bot.TOKEN):
             admin_user = AdminUser(
@@ -162,20 +164,41 @@ class AuthProvider(BaseAuthProvider):
 
         raise LoginFailed(msg='Login failed.')
 
+    @staticmethod
+    async def get_roles(
+            config: Config,
+            sessionmaker: async_sessionmaker,
+            admin_id: Optional[int],
+    ) -> Optional[list]:
+        """
+        Get the roles of the admin.
+
+        Roles of admins from the database are served from a short-lived cache.
+
+        :param config: The Config object.
+        :param sessionmaker: The async_sessionmaker object.
+        :param admin_id: The user ID of the admin.
+        :return: The list of roles or None if the user is not an admin.
+        """
+        if admin_id is None:
+            return None
+        if admin_id in [config.bot.ADMIN_ID, config.bot.DEV_ID]:
+            return AdminRoles.all()
+        return await admin_roles_cache.get(sessionmaker, admin_id)
+
     async def is_authenticated(self, request) -> bool:
         """
-        Check if the user is authenticated.
+        Check if the user is authenticated and resolve the actual roles of the admin.
 
         :param request: The request object.
         :return: True if the user is authenticated, False otherwise.
         """
         config: Config = request.state.config
         admin_id = request.session.get("id")
-        if (
-                admin_id in [config.bot.ADMIN_ID, config.bot.DEV_ID] or
-                await AdminDB.get_by_user_id(request.state.sessionmaker, admin_id)
-        ):
-            request.state.user = request.session
+        roles = await self.get_roles(config, request.state.sessionmaker, admin_id)
+
+        if roles is not None:
+            request.state.user = {**request.session, "roles": roles}
             return True
         return False
 
@@ -186,17 +209,16 @@ class AuthProvider(BaseAuthProvider):
         :param request: The request object.
         :return: The admin user as a MyAdminUser object.
         """
-        config: Config = request.state.config
-        admin_id = request.session.get("id")
-
-        if admin_id not in [config.bot.ADMIN_ID, config.bot.DEV_ID]:
-            async def get_admin():
-                admin = await AdminDB.get(request.state.sessionmaker, admin_id)
-                request.state.user["roles"] = admin.roles
+        return AdminUser(**request.state.user)
 
-            asyncio.create_task(get_admin())
+    def get_middleware(self, admin: 'BaseAdmin') -> Middleware:
+        """
+        Get the authentication middleware for the admin.
 
-        return AdminUser(**request.state.user)
+        :param admin: The BaseAdmin object.
+        :return: The custom authentication middleware.
+        """
+        return Middleware(AuthMiddleware, provider=self)  # type: ignore
 
     async def logout(self, request: Request, response: Response) -> Response:
         """
@@ -219,6 +241,55 @@ class AuthMiddleware(BaseAuthMiddleware):
 
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
+        # Whether login is not required per (scope type, method, path)
+        self._lookup: LRUCache = LRUCache(maxsize=LOOKUP_SIZE)
+
+    def _is_open_route(self, route: BaseRoute) -> bool:
+        """
+        Check if the route is authorized without login.
+
+        :param route: The route of the admin app.
+        :return: True if login is not required for the route, False otherwise.
+        """
+        return (
+                getattr(route, "path", None) in self.allow_paths
+                or getattr(route, "name", None) in self.allow_routes
+                or getattr(getattr(route, "endpoint", None), "_login_not_required", False)
+        )
+
+    @staticmethod
+    def _resolve_route(scope: Scope) -> Optional[BaseRoute]:
+        """
+        Resolve the route of the request the way the router does: the first full match in order,
+        otherwise the first partial match (e.g. a route with another method).
+
+        :param scope: The ASGI scope of the request.
+        :return: The route or None if no route matches.
+        """
+        partial = None
+        for route in scope["app"].routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route
+            if match == Match.PARTIAL and partial is None:
+                partial = route
+        return partial
+
+    def _is_login_not_required(self, scope: Scope) -> bool:
+        """
+        Check if the requested endpoint is authorized without login.
+
+        The result is cached per method and path, the routes of the admin app don't change.
+
+        :param scope: The ASGI scope of the request.
+        :return: True if login is not required, False otherwise.
+        """
+        key = (scope["type"], scope.get("method"), get_route_path(scope))
+        is_open = self._lookup.get(key)
+        if is_open is None:
+            route = self._resolve_route(scope)
+            is_open = self._lookup[key] = route is not None and self._is_open_route(route)
+        return is_open
 
     async def dispatch(
             self, request: Request, call_next: RequestResponseEndpoint
@@ -234,24 +305,7 @@ class AuthMiddleware(BaseAuthMiddleware):
         - Their name is in `allow_routes`
         - The user is already authenticated
         """
-        _admin_app: Starlette = request.scope["app"]
-        current_route: Optional[Union[Route, Mount, WebSocketRoute]] = None
-        for route in _admin_app.routes:
-            match, _ = route.matches(request.scope)
-            if match == Match.FULL:
-                assert isinstance(route, (Route, Mount, WebSocketRoute))
-                current_route = route
-                break
-        if (
-                (current_route is not None and current_route.path in self.allow_paths)
-                or (current_route is not None and current_route.name in self.allow_routes)
-                or (
-                current_route is not None
-                and hasattr(current_route, "endpoint")
-                and getattr(current_route.endpoint, "_login_not_required", False)
-        )  # noqa
-                or await self.provider.is_authenticated(request)
-        ):
+        if self._is_login_not_required(request.scope) or await self.provider.is_authenticated(request):
             return await call_next(request)
         return RedirectResponse(
             "{url}".format(
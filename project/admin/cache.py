@@ -0,0 +1,48 @@
+from typing import Union, List
+
+from cachetools import TTLCache
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from project.db.models import AdminDB
+
+
+class AdminRolesCache:
+    """
+    Cache of admin roles by user ID with a short time-to-live.
+
+    Keeps the admin panel from querying the admins table on every request.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60) -> None:
+        """
+        Initialize the AdminRolesCache.
+
+        :param maxsize: The maximum number of cached admins.
+        :param ttl: The time-to-live (TTL) in seconds of a cached entry.
+        """
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, sessionmaker: async_sessionmaker, user_id: int) -> Union[List[str], None]:
+        """
+        Get the roles of the admin, querying the database on a cache miss.
+
+        :param sessionmaker: The async_sessionmaker object.
+        :param user_id: The user ID of the admin.
+        :return: The list of roles or None if the user is not an admin.
+        """
+        if user_id in self._cache:
+            return self._cache[user_id]
+
+        admin = await AdminDB.get_by_user_id(sessionmaker, user_id)
+        roles = admin.roles if admin else None
+        self._cache[user_id] = roles
+        return roles
+
+    def clear(self) -> None:
+        """
+        Drop all cached entries, e.g. after the admins table was changed.
+        """
+        self._cache.clear()
+
+
+admin_roles_cache = AdminRolesCache()
@@ -3,6 +3,7 @@ from starlette_admin.contrib.sqla import Admin
 from ._model_view import AdminRoles
 
 from .admin import AdminView
+from .jobs import JobsView
 from .newsletter import NewsletterView
 from .user import UserView
 from .chat import ChatView
@@ -80,6 +81,15 @@ def admin_views_add(admin: Admin) -> None:  # noqa
             identity=models.TextMessageDB.__admin_identity__,
         )
     )
+    admin.add_view(
+        JobsView(
+            label="Jobs",
+            icon="fas fa-clock",
+            path="/jobs",
+            name="jobs",
+            methods=["GET", "POST"],
+        )
+    )
 
 
 __all__ = [
@@ -1,7 +1,12 @@
+from typing import Any
+
+from starlette.requests import Request
 from starlette_admin import *
 
 from ._model_view import CustomModelView
+from ..cache import admin_roles_cache
 from ...db.models import AdminDB
+from ...db.segments import Segments
 
 ROLE_CHOICES = (
     ("create", "Creation"),
@@ -38,3 +43,20 @@ class AdminView(CustomModelView):
     ]
     exclude_fields_from_create = ["created_at"]
     searchable_fields = [c.name for c in AdminDB.__table__.columns]  # type: ignore
+
+    async def after_create(self, request: Request, obj: Any) -> None:
+        admin_roles_cache.clear()
+        await self._update_segment(request)
+
+    async def after_edit(self, request: Request, obj: Any) -> None:
+        admin_roles_cache.clear()
+        await self._update_segment(request)
+
+    async def after_delete(self, request: Request, obj: Any) -> None:
+        admin_roles_cache.clear()
+        await self._update_segment(request)
+
+    @staticmethod
+    async def _update_segment(request: Request) -> None:
+        segments: Segments = request.state.segments
+        await segments.set_admins(await AdminDB.get_all_ids(request.state.sessionmaker))
@@ -9,6 +9,7 @@ from starlette_admin.exceptions import FormValidationError
 
 from ._model_view import CustomModelView
 from ...db.models import ChatDB
+from ...db.segments import Segments
 
 
 class ChatView(CustomModelView):
@@ -91,3 +92,15 @@ class ChatView(CustomModelView):
             return obj
         except Exception as e:
             return self.handle_exception(e)
+
+    async def after_create(self, request: Request, obj: Any) -> None:
+        segments: Segments = request.state.segments
+        await segments.set_chat(obj.id, obj.type, obj.broadcast)
+
+    async def after_edit(self, request: Request, obj: Any) -> None:
+        segments: Segments = request.state.segments
+        await segments.set_chat(obj.id, obj.type, obj.broadcast)
+
+    async def after_delete(self, request: Request, obj: Any) -> None:
+        segments: Segments = request.state.segments
+        await segments.remove([obj.id])
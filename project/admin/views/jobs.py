@@ -0,0 +1,74 @@
+from typing import Any, Dict, List
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from starlette.exceptions import HTTPException
+from starlette.requests import Request
+from starlette.responses import Response, RedirectResponse
+from starlette.status import HTTP_303_SEE_OTHER, HTTP_403_FORBIDDEN, HTTP_404_NOT_FOUND
+from starlette.templating import Jinja2Templates
+from starlette_admin import CustomView
+
+from ._model_view import AdminRoles
+from ...scheduler.profiler import JobProfiler
+
+
+class JobsView(CustomView):
+    """
+    View of the scheduler jobs with their profiling in the admin panel.
+
+    - GET lists the jobs, with `?job_id=` the last profiles of the job,
+      with `?job_id=&download=` the profile data in the pstats format.
+    - POST enables or disables profiling of a job.
+    """
+
+    def is_accessible(self, request: Request) -> bool:
+        return AdminRoles.READ in request.state.user["roles"]
+
+    async def render(self, request: Request, templates: Jinja2Templates) -> Response:
+        profiler: JobProfiler = request.state.profiler
+
+        if request.method == "POST":
+            if AdminRoles.EDIT not in request.state.user["roles"]:
+                raise HTTPException(HTTP_403_FORBIDDEN)
+            form = await request.form()
+            await profiler.set_enabled(str(form["job_id"]), form.get("enabled") == "1")
+            return RedirectResponse(request.url, status_code=HTTP_303_SEE_OTHER)
+
+        job_id = request.query_params.get("job_id")
+        download = request.query_params.get("download")
+        if job_id and download is not None:
+            data = await profiler.get_profile_data(job_id, int(download))
+            if data is None:
+                raise HTTPException(HTTP_404_NOT_FOUND)
+            return Response(
+                data,
+                media_type="application/octet-stream",
+                headers={"Content-Disposition": f'attachment; filename="{job_id}-{download}.prof"'},
+            )
+
+        return templates.TemplateResponse(
+            "jobs.html",
+            {
+                "request": request,
+                "jobs": await self._get_jobs(request.state.scheduler, profiler),
+                "job_id": job_id,
+                "profiles": await profiler.get_profiles(job_id) if job_id else [],
+            },
+        )
+
+    @staticmethod
+    async def _get_jobs(scheduler: AsyncIOScheduler, profiler: JobProfiler) -> List[Dict[str, Any]]:
+        """
+        Get the jobs of the scheduler with their profiling status.
+        """
+        enabled = await profiler.get_enabled()
+        return [
+            {
+                "id": job.id,
+                "func": job.func_ref,
+                "trigger": str(job.trigger),
+                "next_run_time": job.next_run_time,
+                "profiling": job.id in enabled,
+            }
+            for job in scheduler.get_jobs()
+        ]
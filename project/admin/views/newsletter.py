@@ -2,18 +2,21 @@ import asyncio
 import re
 from contextlib import suppress
 from datetime import datetime
-from typing import Dict, Any, List, Union, Optional, Sequence
+from functools import partial
+from typing import AsyncIterator, Dict, Any, List, Union, Optional, Sequence
 from uuid import uuid4
 
 from aiogram import Bot
-from aiogram.exceptions import TelegramRetryAfter, TelegramBadRequest
-from aiogram.types import BufferedInputFile
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import BufferedInputFile, Message
 from aiogram.utils.keyboard import InlineKeyboardMarkup as Markup
 from aiogram.utils.keyboard import InlineKeyboardButton as Button
 from apscheduler.jobstores.base import JobLookupError
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.date import DateTrigger
+from redis.asyncio import Redis
+from sqlalchemy import inspect
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from starlette.requests import Request
 
@@ -24,9 +27,13 @@ from sulguk import SULGUK_PARSE_MODE
 
 from ._model_view import CustomModelView
 from .fields.tiny_mceeditor import TINY_TOOLBAR, TINY_EXTRA_OPTIONS
+from ...bot.utils.audience import AudiencePruner
 from ...bot.utils.formatters import format_weekly_notify_to_message
+from ...bot.utils.messages import send_with_retries
 from ...config import Config
 from ...db.models import NewsletterDB, ChatDB, UserDB, AdminDB
+from ...db.segments import Segments, SegmentError, parse_segment
+from ...scheduler.queues import RedisQueue
 from ...scheduler.tasks.weekly_update_digest import get_update_weekly_stats
 
 
@@ -82,10 +89,21 @@ class NewsletterView(CustomModelView):
                 ("private", "Private"),
                 ("channel", "Channel"),
                 ("group", "Group"),
+                ("segment", "Segment"),
             ],
             select2=False,
             help_text="Select the chat type to send the newsletter.",
         ),
+        StringField(
+            NewsletterDB.segment.name, "Segment",
+            required=False,
+            exclude_from_list=True,
+            help_text="Audience of the \"Segment\" chat type: segments combined with | (or), & (and) "
+                      "and - (but not), from left to right. Segments: users, subscribed, admins, groups, "
+                      "channels, chats, active_<N>d (active in the last N days), members_<M> "
+                      "(chats with at least M members).",
+            placeholder="active_30d & subscribed - admins",
+        ),
         BooleanField(
             NewsletterDB.broadcast.name, "Broadcast",
             required=False,
@@ -121,6 +139,11 @@ class NewsletterView(CustomModelView):
         self._custom_validate(request, data)
         return await super().edit(request, pk, data)
 
+    async def before_edit(self, request: Request, data: Dict[str, Any], obj: NewsletterDB) -> None:
+        # Forget the file_id of the uploaded image if the image is replaced or removed
+        if inspect(obj).attrs.image.history.has_changes():
+            obj.image_file_id = None
+
     async def delete(self, request: Request, pks: List[Any]) -> Optional[int]:
         scheduler: AsyncIOScheduler = request.state.scheduler
         objs: Sequence[NewsletterDB] = await self.find_by_pks(request, pks)
@@ -145,12 +168,14 @@ class NewsletterView(CustomModelView):
         # Formatting the newsletter using a helper method
         newsletter = await self.newsletter_format(newsletter, request.state.sessionmaker)
 
+        image_file_id = newsletter.image_file_id
         try:
             # Sending the formatted newsletter to the admin
             await self._send_message(newsletter, request.state.bot, request.session.get("id"))
         except Exception as e:
             # Handling exceptions if the message sending fails
             raise ActionFailed(str(e))
+        await self._save_image_file_id(request.state.sessionmaker, newsletter, image_file_id)
 
         return "A message has been sent to you in chat with the bot!"
 
@@ -162,13 +187,13 @@ class NewsletterView(CustomModelView):
         submit_btn_text="Continue",
         submit_btn_class="btn-outline-success",
     )
-    async def run_newsletter_action(self, _: Request, pk: int) -> str:
+    async def run_newsletter_action(self, request: Request, pk: int) -> str:
         """
         Row action to run the newsletter and send it to the selected chat type.
         """
-        # Creating a background task to run the newsletter
-        loop = asyncio.get_event_loop()
-        _ = loop.create_task(self.run_newsletter(int(pk)))
+        # Enqueueing the newsletter, it is sent by the process running the scheduler
+        broadcasts: RedisQueue = request.state.broadcasts
+        await broadcasts.put(int(pk))
 
         return "The newsletter is up and running!"
 
@@ -182,10 +207,12 @@ class NewsletterView(CustomModelView):
         bot: Bot = getattr(loop, "bot", None)
         config: Config = getattr(loop, "config", None)
         sessionmaker = getattr(loop, "sessionmaker", None)
+        redis: Redis = getattr(loop, "redis", None)
 
         # Checking if essential components are set up in the event loop
-        if not bot or not config or not sessionmaker:
-            raise RuntimeError("Bot, config, or sessionmaker not properly set up in the event loop.")
+        if not bot or not config or not sessionmaker or not redis:
+            raise RuntimeError("Bot, config, sessionmaker, or redis not properly set up in the event loop.")
+        segments = Segments(redis)
 
         # Retrieving the newsletter based on its ID or job ID
         if isinstance(newsletter_id, str):
@@ -198,23 +225,21 @@ class NewsletterView(CustomModelView):
             # If the newsletter ID is an integer, retrieve the newsletter by ID
             newsletter = await NewsletterDB.get(sessionmaker, newsletter_id)
 
-        # Retrieving the chat IDs based on the newsletter's chat type
-        chats = await cls._get_chat_ids(sessionmaker, newsletter, config)
         # Formatting the newsletter using a helper method
         newsletter = await cls.newsletter_format(newsletter, sessionmaker)
 
-        for chat_id in chats:
-            try:
-                # Sending the formatted newsletter to each chat
-                await cls._send_message(newsletter, bot, chat_id)
-            except TelegramRetryAfter as e:
-                # If rate limited, wait and try again
-                await asyncio.sleep(e.retry_after)
-                await cls._send_message(newsletter, bot, chat_id)
-            except (TelegramBadRequest, Exception):
-                # If chat is not found, or bot is blocked, or any other error, skip.
-                pass
+        image_file_id = newsletter.image_file_id
+        pruner = AudiencePruner(sessionmaker, "newsletter", f"newsletter {newsletter.id}", segments)
+        # Streaming the chat IDs based on the newsletter's chat type
+        async for chat_id in cls._iter_chat_ids(sessionmaker, segments, newsletter, config):
+            # Sending the formatted newsletter to each chat, retrying after flood waits.
+            # If chat is not found, or bot is blocked, the chat is pruned from the future audiences.
+            result = await send_with_retries(partial(cls._send_message, newsletter, bot, chat_id), "newsletter")
+            await pruner.track(chat_id, result)
+            # Saving the file_id of the image once it is uploaded, the next runs reuse it too
+            image_file_id = await cls._save_image_file_id(sessionmaker, newsletter, image_file_id)
             await asyncio.sleep(0.05)
+        await pruner.close()
 
         if newsletter.start_date:
             # Updating the newsletter's broadcast status if it has a start date
@@ -233,22 +258,49 @@ class NewsletterView(CustomModelView):
         return newsletter
 
     @staticmethod
-    async def _get_chat_ids(sessionmaker: async_sessionmaker, newsletter: NewsletterDB, config: Config):
-        if newsletter.chat_type == "all":
-            chats = await ChatDB.get_all_ids(sessionmaker)
+    async def _iter_chat_ids(
+            sessionmaker: async_sessionmaker,
+            segments: Segments,
+            newsletter: NewsletterDB,
+            config: Config,
+    ) -> AsyncIterator[int]:
+        if newsletter.chat_type == "segment":
+            chats = segments.iter_ids(newsletter.segment)
+        elif newsletter.chat_type == "all":
+            chats = ChatDB.iter_all_ids(sessionmaker)
         elif newsletter.chat_type == "admin":
-            chats = await AdminDB.get_all_ids(sessionmaker)
-            chats += [config.bot.DEV_ID, config.bot.ADMIN_ID]
+            for chat_id in await AdminDB.get_all_ids(sessionmaker) + [config.bot.DEV_ID, config.bot.ADMIN_ID]:
+                yield chat_id
+            return
         elif newsletter.chat_type == "private":
-            chats = await UserDB.get_all_ids(sessionmaker)
+            chats = UserDB.iter_all_ids(sessionmaker)
         else:
-            chats = await ChatDB.get_ids(sessionmaker, newsletter.chat_type)
-        return chats
+            chats = ChatDB.iter_ids(sessionmaker, newsletter.chat_type)
+        async for chat_id in chats:
+            yield chat_id
+
+    @staticmethod
+    async def _save_image_file_id(
+            sessionmaker: async_sessionmaker,
+            newsletter: NewsletterDB,
+            saved_file_id: Union[str, None],
+    ) -> Union[str, None]:
+        """
+        Save the file_id of the newsletter image if it changed since the last save.
+
+        :return: The saved file_id.
+        """
+        if newsletter.image_file_id != saved_file_id:
+            await NewsletterDB.update(sessionmaker, id=newsletter.id, image_file_id=newsletter.image_file_id)
+        return newsletter.image_file_id
 
     @classmethod
-    async def _send_message(cls, newsletter: NewsletterDB, bot: Bot, chat_id: int) -> None:
+    async def _send_message(cls, newsletter: NewsletterDB, bot: Bot, chat_id: int) -> Message:
         """
         Send a message with the newsletter content and buttons to a chat.
+
+        The image is uploaded once, the file_id returned by Telegram is kept in `newsletter.image_file_id`
+        and the next sends reference it instead of uploading the image again.
         """
         message_params = {
             "chat_id": chat_id,
@@ -257,12 +309,20 @@ class NewsletterView(CustomModelView):
         }
 
         if newsletter.image_path:
-            message_params["photo"] = BufferedInputFile.from_file(newsletter.image_path)
             message_params["caption"] = newsletter.content
-            await bot.send_photo(**message_params)
-        else:
-            message_params["text"] = newsletter.content
-            await bot.send_message(**message_params)
+            if newsletter.image_file_id:
+                try:
+                    return await bot.send_photo(photo=newsletter.image_file_id, **message_params)
+                except TelegramBadRequest as e:
+                    # The file_id is not valid for this bot or Bot API server, upload the image again
+                    if "file identifier" not in e.message:
+                        raise
+                    newsletter.image_file_id = None
+            message = await bot.send_photo(photo=BufferedInputFile.from_file(newsletter.image_path), **message_params)
+            newsletter.image_file_id = message.photo[-1].file_id
+            return message
+        message_params["text"] = newsletter.content
+        return await bot.send_message(**message_params)
 
     @staticmethod
     def _build_buttons(buttons: List[Dict[str, str]]) -> Markup:
@@ -316,6 +376,9 @@ class NewsletterView(CustomModelView):
         # Validate start date and cron
         cls.__validate_date_and_cron(data.get("start_date"), data.get("start_cron"))
 
+        # Validate the segment expression
+        cls.__validate_segment(data.get("chat_type"), data.get("segment"))
+
         # Validate broadcast checkbox
         cls.__validate_broadcast_checkbox(data, scheduler)
 
@@ -338,6 +401,17 @@ class NewsletterView(CustomModelView):
         if len(content) > limit:
             raise FormValidationError({"content": f"The text limit is {limit} characters."})
 
+    @staticmethod
+    def __validate_segment(chat_type: str, segment: Optional[str]) -> None:
+        if chat_type != "segment":
+            return
+        if not segment:
+            raise FormValidationError({"segment": "Segment is required for the \"Segment\" chat type."})
+        try:
+            parse_segment(segment)
+        except SegmentError as e:
+            raise FormValidationError({"segment": str(e)})
+
     @staticmethod
     def __validate_date_and_cron(start_date: Optional[datetime], start_cron: Optional[str]) -> None:
         if not start_date and not start_cron:
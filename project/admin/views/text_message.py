@@ -1,3 +1,6 @@
+from typing import Any, Dict
+
+from sqlalchemy import inspect
 from starlette.requests import Request
 from starlette_admin import *
 
@@ -44,3 +47,8 @@ class TextMessageView(CustomModelView):
 
     def can_create(self, request: Request) -> bool:
         return False
+
+    async def before_edit(self, request: Request, data: Dict[str, Any], obj: TextMessageDB) -> None:
+        # Forget the file_id of the preview photo if the preview URL is changed
+        if inspect(obj).attrs.preview_url.history.has_changes():
+            obj.preview_file_id = None
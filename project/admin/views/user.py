@@ -1,8 +1,11 @@
+from typing import Any
+
 from starlette.requests import Request
 from starlette_admin import *
 
 from ._model_view import CustomModelView
 from ...db.models import UserDB
+from ...db.segments import Segments
 
 STATE_CHOICES = (
     ("kicked", "Kicked"),
@@ -51,6 +54,10 @@ class UserView(CustomModelView):
     exclude_fields_from_create = ["created_at"]
     searchable_fields = [c.name for c in UserDB.__table__.columns]  # type: ignore
 
+    async def after_edit(self, request: Request, obj: Any) -> None:
+        segments: Segments = request.state.segments
+        await segments.set_user(obj.id, obj.state, obj.broadcast)
+
     def can_create(self, request: Request) -> bool:
         return False
 
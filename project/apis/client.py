@@ -1,8 +1,11 @@
+import time
 from typing import Dict, Any
 
 import aiohttp
 from aiohttp import ContentTypeError, ServerDisconnectedError
 
+from ..monitoring.metrics import API_REQUEST_DURATION
+
 
 class ClientAPI:
     """
@@ -27,14 +30,18 @@ class ClientAPI:
             method: str,
             params: dict = None,
     ) -> Any:
+        started, status = time.perf_counter(), "error"
         try:
             async with aiohttp.ClientSession(headers=self.headers) as session:
                 async with session.get(
                         self.base_url + method,
                         params=params,
                 ) as response:
+                    status = str(response.status)
                     return await response.json()
         except (ContentTypeError, ServerDisconnectedError, TimeoutError):
             ...
         except Exception:
             raise
+        finally:
+            API_REQUEST_DURATION.labels(type(self).__name__, status).observe(time.perf_counter() - started)
@@ -1,10 +1,25 @@
 import asyncio
-from typing import List, Literal, Union
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Dict, List, Literal, Union
 
 from aiohttp import ClientConnectorError
 
 from .models import Issue
 from ..client import ClientAPI
+from ...monitoring.metrics import GITHUB_ISSUES_PARSED
+
+
+def parse_issues(results: List[Dict[str, Any]]) -> List[Issue]:
+    """
+    Converts a page of GitHub API results to Issue objects, skipping pull requests.
+
+    Runs in the process pool, the BeautifulSoup validators of Issue are CPU-bound.
+
+    :param results: List of issues as returned by the GitHub API.
+    :return: List of Issue objects.
+    """
+    return [Issue(**result) for result in results if isinstance(result, dict) and not result.get("pull_request")]
 
 
 class GitHubAPI(ClientAPI):
@@ -18,6 +33,7 @@ class GitHubAPI(ClientAPI):
             owner: str,
             repo: str,
             base_url: str = "https://api.github.com",
+            max_workers: Union[int, None] = None,
     ) -> None:
         """
         Initializes the GitHubAPI object.
@@ -26,6 +42,7 @@ class GitHubAPI(ClientAPI):
         :param owner: Owner of the GitHub repository.
         :param repo: GitHub repository name.
         :param base_url: Base URL for GitHub API (default is "https://api.github.com").
+        :param max_workers: Number of processes parsing the issues (default is the number of CPUs).
         """
         self.token = token
         self.owner = owner
@@ -35,8 +52,34 @@ class GitHubAPI(ClientAPI):
             f"Authorization": f"Bearer {self.token}",
             "Accept": "application/vnd.github.full+json",
         }
+        self.max_workers = max_workers
+        self._executor: Union[ProcessPoolExecutor, None] = None
         super().__init__(base_url, headers=self.headers)
 
+    async def _parse_issues(self, results: List[Dict[str, Any]]) -> List[Issue]:
+        """
+        Converts a page of GitHub API results to Issue objects in the process pool,
+        so that parsing doesn't block the event loop.
+
+        :param results: List of issues as returned by the GitHub API.
+        :return: List of Issue objects.
+        """
+        if self._executor is None:
+            # Not forked, the process already runs threads (loop monitor watchdog, metrics server)
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=get_context("spawn"))
+        loop = asyncio.get_running_loop()
+        issues = await loop.run_in_executor(self._executor, parse_issues, results)
+        GITHUB_ISSUES_PARSED.inc(len(issues))
+        return issues
+
+    def close(self) -> None:
+        """
+        Shuts down the process pool.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
     async def get_issue(self, issue_number: int) -> Issue:
         """
         Retrieves information about a specific GitHub issue.
@@ -60,12 +103,26 @@ class GitHubAPI(ClientAPI):
         :param state: State of the issues (e.g., "open", "closed" or "all").
         :return: List of Issue objects representing the GitHub issues.
         """
-        method = f"/repos/{self.owner}/{self.repo}/issues"
-        params = {"state": state, "page": page, "sort": "created", "direction": "desc", "per_page": 100}
-        results = await self._get(method, params=params)
+        results = await self._get_issues_page(page, state)
         if not results:
             return None
-        return [Issue(**result) for result in results if isinstance(result, dict) and not result.get("pull_request")]
+        return await self._parse_issues(results)
+
+    async def _get_issues_page(
+            self,
+            page: int,
+            state: Literal['open', 'closed', 'all'],
+    ) -> Union[List[Dict[str, Any]], None]:
+        """
+        Retrieves a page of GitHub issues as returned by the GitHub API.
+
+        :param page: Page number.
+        :param state: State of the issues (e.g., "open", "closed" or "all").
+        :return: List of issues (including pull requests).
+        """
+        method = f"/repos/{self.owner}/{self.repo}/issues"
+        params = {"state": state, "page": page, "sort": "created", "direction": "desc", "per_page": 100}
+        return await self._get(method, params=params)
 
     async def get_issues_all(self, state: Literal['open', 'closed', 'all']) -> List[Issue]:
         """
@@ -74,21 +131,35 @@ class GitHubAPI(ClientAPI):
         :param state: State of the issues (e.g., "open" or "closed").
         :return: List of Issue objects representing all GitHub issues.
         """
-        page, issues = 1, []
+        page, parsing = 1, []
 
-        async def _get_issues(p, s):
+        async def _get_issues_page(p, s):
             try:
-                return await self.get_issues(p, s)
+                return await self._get_issues_page(p, s)
             except ClientConnectorError as e:
                 if "Cannot connect to host api.github.com" in str(e):
                     await asyncio.sleep(1)
-                    return await _get_issues(p, s)
+                    return await _get_issues_page(p, s)
                 raise e
 
-        while True:
-            results = await _get_issues(page, state)
-            if not results:
-                break
-            issues.extend(results)
-            page += 1
-        return issues
+        # Pages are parsed in the process pool while the next ones are fetched
+        try:
+            while True:
+                results = await _get_issues_page(page, state)
+                if not results:
+                    break
+                parsing.append(asyncio.ensure_future(self._parse_issues(results)))
+                page += 1
+        except BaseException:
+            # Don't leave the pages being parsed pending
+            for future in parsing:
+                future.cancel()
+            await asyncio.gather(*parsing, return_exceptions=True)
+            raise
+
+        # Wait for every page before raising the first error, so that no exception is left unretrieved
+        pages = await asyncio.gather(*parsing, return_exceptions=True)
+        for issues in pages:
+            if isinstance(issues, BaseException):
+                raise issues
+        return [issue for issues in pages for issue in issues]
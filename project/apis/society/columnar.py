@@ -0,0 +1,99 @@
+import mmap
+import struct
+from typing import List
+
+from .models import User
+
+# File header: magic, format version, number of users, data version stamp
+HEADER = struct.Struct("<4sIIQ")
+# Index record: awards_count, then (offset, length) of id, name and username in the string table
+RECORD = struct.Struct("<I6I")
+
+MAGIC = b"STOP"
+FORMAT_VERSION = 1
+
+
+def pack_users(users: List[User], version: int) -> bytes:
+    """
+    Packs a list of User models into the columnar binary layout.
+
+    The layout is a fixed-size header, a fixed-width index with one record per user
+    and a string table with UTF-8 encoded strings referenced by the index.
+
+    :param users: The list of User models to be packed.
+    :param version: The data version stamp.
+    :return: The packed data.
+    """
+    index, strings = bytearray(), bytearray()
+    strings_offset = HEADER.size + RECORD.size * len(users)
+
+    for user in users:
+        fields = []
+        for value in (user.id, user.name, user.username):
+            encoded = value.encode()
+            fields += [strings_offset + len(strings), len(encoded)]
+            strings += encoded
+        index += RECORD.pack(user.awards_count, *fields)
+
+    return HEADER.pack(MAGIC, FORMAT_VERSION, len(users), version) + bytes(index) + bytes(strings)
+
+
+class ColumnarUsers:
+    """
+    Read-only memory-mapped view over a file in the columnar binary layout.
+
+    Any range of users is decoded in O(range size) without reading the rest of the file.
+
+    :param filename: The path to the binary file.
+    """
+
+    def __init__(self, filename: str) -> None:
+        """
+        Opens and maps the binary file.
+
+        :param filename: The path to the binary file.
+        """
+        with open(filename, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, format_version, self.count, self.version = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or format_version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported society top file: {filename}")
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _string(self, offset: int, length: int) -> str:
+        return self._mmap[offset:offset + length].decode()
+
+    def get(self, index: int) -> User:
+        """
+        Decodes a single user by its position in the top.
+
+        :param index: The position of the user, starting from 0.
+        :return: The User model.
+        """
+        awards_count, *fields = RECORD.unpack_from(self._mmap, HEADER.size + RECORD.size * index)
+        return User(
+            id=self._string(fields[0], fields[1]),
+            name=self._string(fields[2], fields[3]),
+            username=self._string(fields[4], fields[5]),
+            awards_count=awards_count,
+        )
+
+    def slice(self, start: int, stop: int) -> List[User]:
+        """
+        Decodes a range of users by their positions in the top.
+
+        :param start: The start position, inclusive.
+        :param stop: The stop position, exclusive.
+        :return: The list of User models.
+        """
+        return [self.get(index) for index in range(max(start, 0), min(stop, self.count))]
+
+    def close(self) -> None:
+        """
+        Unmaps the binary file.
+        """
+        self._mmap.close()
@@ -1,8 +1,14 @@
+import asyncio
 import json
-from typing import List, Union, Dict
+import os
+import time
+from typing import List, Union, Dict, Tuple
+from uuid import uuid4
 
 import aiofiles
+import aiofiles.os
 
+from .columnar import ColumnarUsers, pack_users
 from .models import User
 from ...config import UPLOADS_DIR
 
@@ -11,52 +17,182 @@ class SocietyStorage:
     """
     A class to manage society-related data storage.
 
+    Files are written atomically (write to a temporary file, then rename), so readers never see
+    a partially written file. The parsed list of users is cached in memory per file and reused
+    until the file on disk changes.
+
+    Alongside the JSON file the top is also written in a columnar binary layout, which is
+    memory-mapped to serve pages without deserializing the whole top.
+
     :param filename: The path to the JSON file for society data storage.
+    :param binary_filename: The path to the binary file for society data storage.
+    :param state_filename: The path to the JSON file for per-user crawl state storage.
     """
 
+    # Cache of parsed users per filename: (file signature, version, users)
+    _cache: Dict[str, Tuple[Tuple[int, int, int], int, List[User]]] = {}
+    # Cache of memory-mapped binary files per filename: (file signature, reader)
+    _readers: Dict[str, Tuple[Tuple[int, int, int], ColumnarUsers]] = {}
+
     def __init__(
             self,
             filename: str = f"{UPLOADS_DIR}/json/society-top.json",
+            binary_filename: str = f"{UPLOADS_DIR}/json/society-top.bin",
+            state_filename: str = f"{UPLOADS_DIR}/json/society-state.json",
     ) -> None:
         """
         Initializes the SocietyStorage instance.
 
         :param filename: The path to the JSON file for society data storage.
+        :param binary_filename: The path to the binary file for society data storage.
+        :param state_filename: The path to the JSON file for per-user crawl state storage.
         """
         self.filename = filename
+        self.binary_filename = binary_filename
+        self.state_filename = state_filename
+
+    @staticmethod
+    def _signature(stat: os.stat_result) -> Tuple[int, int, int]:
+        """
+        Builds a signature of the file that changes on every atomic write.
+
+        :param stat: The stat result of the file.
+        :return: The file signature.
+        """
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    async def _write(filename: str, content: bytes) -> None:
+        """
+        Writes content to the specified file asynchronously and atomically.
 
-    async def _save(self, data: Union[List, Dict]) -> None:
+        :param filename: The path to the file.
+        :param content: The content to be written.
         """
-        Saves data to the specified JSON file asynchronously.
+        # Unique per write, the same process may save the same file concurrently
+        tmp_filename = f"{filename}.{os.getpid()}.{uuid4().hex}.tmp"
+        async with aiofiles.open(tmp_filename, "wb") as file:
+            await file.write(content)
+            await file.flush()
+            await asyncio.get_running_loop().run_in_executor(None, os.fsync, file.fileno())
+        await aiofiles.os.replace(tmp_filename, filename)
 
+    @classmethod
+    async def _save(cls, filename: str, data: Union[List, Dict]) -> None:
+        """
+        Saves data to the specified JSON file asynchronously and atomically.
+
+        :param filename: The path to the JSON file.
         :param data: The data to be saved.
         """
-        async with aiofiles.open(self.filename, "w") as file:
-            await file.write(json.dumps(data))
+        await cls._write(filename, json.dumps(data).encode())
 
-    async def _load(self) -> Dict:
+    @staticmethod
+    async def _load(filename: str) -> Union[List, Dict]:
         """
         Loads data from the specified JSON file asynchronously.
 
+        :param filename: The path to the JSON file.
         :return: The loaded data.
         """
-        async with aiofiles.open(self.filename, "r") as file:
+        async with aiofiles.open(filename, "r") as file:
             return json.loads(await file.read())
 
     async def save_users(self, users: List[User]) -> None:
         """
-        Saves a list of User models to the society's top JSON file.
+        Saves a list of User models to the society's top JSON file with a new version stamp.
 
         :param users: The list of User models to be saved.
         """
-        data = [user.model_dump() for user in users]
-        await self._save(data)
+        version = time.time_ns()
+        data = {"version": version, "users": [user.model_dump() for user in users]}
+        await self._write(self.binary_filename, pack_users(users, version))
+        await self._save(self.filename, data)
+
+        stat = os.stat(self.filename)
+        self._cache[self.filename] = (self._signature(stat), version, list(users))
 
     async def get_users(self) -> List[User]:
         """
         Retrieves a list of User models from the society's top JSON file.
 
-        :return: The list of User models.
+        The file is read and validated only if it has changed since the last call.
+
+        :return: The list of User models, a copy of the cached list.
+        """
+        stat = os.stat(self.filename)
+        signature = self._signature(stat)
+
+        cached = self._cache.get(self.filename)
+        if cached is not None and cached[0] == signature:
+            return list(cached[2])
+
+        data = await self._load(self.filename)
+        # Files written before versioning contain a plain list of users
+        if isinstance(data, list):
+            version, data = 0, data
+        else:
+            version, data = data.get("version", 0), data.get("users", [])
+
+        users = [User(**user) for user in data]
+        self._cache[self.filename] = (signature, version, users)
+        return list(users)
+
+    async def _get_reader(self) -> Union[ColumnarUsers, None]:
+        """
+        Retrieves the memory-mapped reader of the binary file, remapping it if the file has changed.
+
+        :return: The reader or None if the binary file does not exist.
+        """
+        try:
+            stat = os.stat(self.binary_filename)
+        except FileNotFoundError:
+            return None
+        signature = self._signature(stat)
+
+        cached = self._readers.get(self.binary_filename)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        reader = ColumnarUsers(self.binary_filename)
+        self._readers[self.binary_filename] = (signature, reader)
+        if cached is not None:
+            cached[1].close()
+        return reader
+
+    async def get_page(self, page: int, page_size: int) -> Tuple[List[User], int]:
+        """
+        Retrieves a page of User models from the society's top.
+
+        The page is decoded from the memory-mapped binary file when it exists,
+        otherwise it is sliced from the cached JSON data.
+
+        :param page: The page number, starting from 1.
+        :param page_size: The number of users on a page.
+        :return: The users of the page and the total number of users.
+        """
+        reader = await self._get_reader()
+        if reader is not None:
+            return reader.slice(page_size * (page - 1), page_size * page), len(reader)
+
+        users = await self.get_users()
+        return users[page_size * (page - 1): page_size * page], len(users)
+
+    async def save_state(self, state: Dict) -> None:
+        """
+        Saves the per-user crawl state next to the society's top JSON file.
+
+        :param state: The crawl state to be saved.
+        """
+        await self._save(self.state_filename, state)
+
+    async def get_state(self) -> Dict:
+        """
+        Retrieves the per-user crawl state, or an empty state if nothing was saved yet.
+
+        :return: The crawl state.
         """
-        data = await self._load()
-        return [User(**user) for user in data]
+        try:
+            return await self._load(self.state_filename)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
@@ -1,21 +1,26 @@
 from fastapi import FastAPI
 
-from .bot import BotMiddleware
-from .config import ConfigMiddleware
-from .database import DBSessionMiddleware
-from .scheduler import SchedulerMiddleware
+from .state import StateMiddleware
 
 
 def app_middlewares_register(app: FastAPI, **kwargs) -> None:
     """
     Register app middlewares.
     """
-    app.add_middleware(SchedulerMiddleware, scheduler=kwargs["scheduler"])  # type: ignore
-    app.add_middleware(DBSessionMiddleware, sessionmaker=kwargs["sessionmaker"])  # type: ignore
-    app.add_middleware(ConfigMiddleware, config=kwargs["config"])  # type: ignore
-    app.add_middleware(BotMiddleware, bot=kwargs["bot"])  # type: ignore
+    app.add_middleware(
+        StateMiddleware,  # type: ignore
+        bot=kwargs["bot"],
+        config=kwargs["config"],
+        sessionmaker=kwargs["sessionmaker"],
+        scheduler=kwargs["scheduler"].scheduler,
+        profiler=kwargs["scheduler"].profiler,
+        broadcasts=kwargs["broadcasts"],
+        issue_events=kwargs["issue_events"],
+        segments=kwargs["segments"],
+    )
 
 
 __all__ = [
     "app_middlewares_register",
+    "StateMiddleware",
 ]
@@ -0,0 +1,32 @@
+from typing import Any
+
+from starlette.types import ASGIApp, Scope, Receive, Send
+
+
+class StateMiddleware:
+    """
+    Pure ASGI middleware for adding shared objects (bot, config, sessionmaker, scheduler,
+    profiler, broadcasts, issue_events, segments) to the request state.
+    """
+
+    def __init__(self, app: ASGIApp, **state: Any) -> None:
+        """
+        Initialize the StateMiddleware.
+
+        :param app: The ASGI app.
+        :param state: The objects to be added to the request state.
+        """
+        self.app = app
+        self.state = state
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Add the objects to the request state and call the next app.
+
+        :param scope: The ASGI scope.
+        :param receive: The ASGI receive channel.
+        :param send: The ASGI send channel.
+        """
+        if scope["type"] in ("http", "websocket"):
+            scope.setdefault("state", {}).update(self.state)
+        await self.app(scope, receive, send)
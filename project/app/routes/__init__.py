@@ -1,10 +1,13 @@
 from fastapi import FastAPI
 
+from .github import router as github_router
 
-def app_routers_include(_: FastAPI) -> None:
+
+def app_routers_include(app: FastAPI) -> None:
     """
     Include app routers.
     """
+    app.include_router(github_router)
 
 
 __all__ = [
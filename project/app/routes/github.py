@@ -0,0 +1,64 @@
+import hashlib
+import hmac
+
+import orjson
+from fastapi import APIRouter
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.status import (
+    HTTP_202_ACCEPTED,
+    HTTP_204_NO_CONTENT,
+    HTTP_400_BAD_REQUEST,
+    HTTP_401_UNAUTHORIZED,
+    HTTP_404_NOT_FOUND,
+)
+
+from ...config import Config
+from ...scheduler.queues import RedisQueue
+
+router = APIRouter()
+
+
+def verify_signature(secret: str, body: bytes, signature: str) -> bool:
+    """
+    Verify the `X-Hub-Signature-256` header of a GitHub webhook delivery.
+
+    :param secret: The secret of the webhook.
+    :param body: The raw request body.
+    :param signature: The value of the header, "sha256=" followed by the HMAC hex digest.
+    :return: True if the signature matches.
+    """
+    expected = "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+@router.post("/github/webhook", include_in_schema=False)
+async def github_webhook(request: Request) -> Response:
+    """
+    GitHub webhook endpoint. Receives `issues` events and enqueues the changed issues,
+    they are applied and notified by the process running the scheduler.
+
+    Responds with 404 if the webhook secret is not configured.
+    """
+    config: Config = request.state.config
+    if not config.github.WEBHOOK_SECRET:
+        return Response(status_code=HTTP_404_NOT_FOUND)
+
+    body = await request.body()
+    if not verify_signature(config.github.WEBHOOK_SECRET, body, request.headers.get("X-Hub-Signature-256", "")):
+        return Response(status_code=HTTP_401_UNAUTHORIZED)
+    if request.headers.get("X-GitHub-Event") != "issues":
+        # Other events, including the "ping" sent on the webhook creation, are ignored
+        return Response(status_code=HTTP_204_NO_CONTENT)
+
+    try:
+        payload = orjson.loads(body)
+        repository, issue_number = payload["repository"]["full_name"], int(payload["issue"]["number"])
+    except (orjson.JSONDecodeError, KeyError, TypeError, ValueError):
+        return Response(status_code=HTTP_400_BAD_REQUEST)
+    if repository.lower() != f"{config.github.OWNER}/{config.github.REPO}".lower():
+        return Response(status_code=HTTP_204_NO_CONTENT)
+
+    issue_events: RedisQueue = request.state.issue_events
+    await issue_events.put(issue_number)
+    return Response(status_code=HTTP_202_ACCEPTED)
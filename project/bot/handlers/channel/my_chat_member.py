@@ -1,7 +1,9 @@
 import asyncio
+import logging
 
 from aiogram import Router, F
 from aiogram.enums import ChatType
+from aiogram.exceptions import TelegramAPIError
 from aiogram.filters.chat_member_updated import (
     ChatMemberUpdatedFilter,
     JOIN_TRANSITION,
@@ -25,10 +27,17 @@ async def bot_added_to_channel(event: ChatMemberUpdated, manager: Manager) -> No
     Bot was added to channel.
     """
     await asyncio.sleep(1.0)
-    await ChatDB.create_or_update(
+    chat_db = await ChatDB.create_or_update(
         manager.sessionmaker,
         id=event.chat.id,
         type=ChatType.CHANNEL,
         title=event.chat.title,
         username=event.chat.username,
     )
+    try:
+        members = await manager.bot.get_chat_member_count(event.chat.id)
+    except TelegramAPIError as e:
+        # The numbers of members are refreshed by the daily rebuild of the segments
+        logging.warning(f"Failed to get the number of members of chat {event.chat.id}: {e}")
+        members = None
+    await manager.segments.set_chat(chat_db.id, chat_db.type, chat_db.broadcast, members=members)
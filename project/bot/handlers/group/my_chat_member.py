@@ -1,7 +1,9 @@
 import asyncio
+import logging
 
 from aiogram import Router, F
 from aiogram.enums import ChatType
+from aiogram.exceptions import TelegramAPIError
 from aiogram.filters.chat_member_updated import (
     ChatMemberUpdatedFilter,
     JOIN_TRANSITION,
@@ -25,13 +27,20 @@ async def bot_added_to_group(event: ChatMemberUpdated, manager: Manager) -> None
     Bot was added to group.
     """
     await asyncio.sleep(1.0)
-    await ChatDB.create_or_update(
+    chat_db = await ChatDB.create_or_update(
         manager.sessionmaker,
         id=event.chat.id,
         type=ChatType.GROUP,
         title=event.chat.title,
         username=event.chat.username,
     )
+    try:
+        members = await manager.bot.get_chat_member_count(event.chat.id)
+    except TelegramAPIError as e:
+        # The numbers of members are refreshed by the daily rebuild of the segments
+        logging.warning(f"Failed to get the number of members of chat {event.chat.id}: {e}")
+        members = None
+    await manager.segments.set_chat(chat_db.id, chat_db.type, chat_db.broadcast, members=members)
 
 
 @router.message(F.migrate_to_chat_id)
@@ -39,10 +48,13 @@ async def group_to_supergroup_migration(message: Message, manager: Manager) -> N
     """
     Group was migrated to supergroup.
     """
-    await ChatDB.create_or_update(
+    chat_db = await ChatDB.create_or_update(
         manager.sessionmaker,
         id=message.migrate_to_chat_id,
         type=ChatType.GROUP,
         title=message.chat.title,
         username=message.chat.username,
     )
+    # The old ID of the group can't receive messages anymore
+    await manager.segments.remove([message.chat.id])
+    await manager.segments.set_chat(chat_db.id, chat_db.type, chat_db.broadcast)
@@ -35,6 +35,7 @@ async def main_menu_callback_query(call: CallbackQuery, manager: Manager) -> Non
             id=manager.user_db.id,
             broadcast=broadcast,
         )
+        await manager.segments.set_user(manager.user_db.id, manager.user_db.state, broadcast)
         await Window.main_menu(manager)
 
     await call.answer()
@@ -3,6 +3,7 @@ from aiogram.types import ChatMemberUpdated
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from project.db.models import UserDB
+from project.db.segments import Segments
 
 router = Router()
 router.my_chat_member.filter(F.chat.type == "private")
@@ -11,12 +12,14 @@ router.my_chat_member.filter(F.chat.type == "private")
 @router.my_chat_member()
 async def my_chat_member(update: ChatMemberUpdated,
                          sessionmaker: async_sessionmaker,
+                         segments: Segments,
                          user_db: UserDB) -> None:
     """
     Handle updates of the bot chat member status.
 
     :param update: The chat member update event.
     :param sessionmaker: The async async_sessionmaker object for creating database sessions.
+    :param segments: The Segments object.
     :param user_db: The user object from database.
     """
     await UserDB.update(
@@ -24,3 +27,4 @@ async def my_chat_member(update: ChatMemberUpdated,
         id=user_db.id,
         state=update.new_chat_member.status,
     )
+    await segments.set_user(user_db.id, update.new_chat_member.status, user_db.broadcast)
@@ -63,15 +63,14 @@ class Window:
 
     @staticmethod
     async def top_contributors(manager: Manager, send_mode: str = "edit") -> None:
-        society_storage = SocietyStorage()
-        stats = await society_storage.get_users()
-
         state_data = await manager.state.get_data()
         page, page_size = state_data.get("page", 1), 15
 
+        society_storage = SocietyStorage()
+        stats, total = await society_storage.get_page(page, page_size)
+
         start = page_size * (page - 1) + 1
-        total_pages = (len(stats) + page_size - 1) // page_size
-        stats = stats[page_size * (page - 1): page_size * page]
+        total_pages = (total + page_size - 1) // page_size
 
         text = await manager.text_message.get(MessageCode.TOP_CONTRIBUTORS)
         text = format_top_contributors_to_message(text, stats, start=start)
@@ -22,6 +22,7 @@ from project.bot.utils.texts.buttons import TextButton
 from project.bot.utils.texts.messages import TextMessage
 from project.config import Config
 from project.db.models import UserDB
+from project.db.segments import Segments
 
 MESSAGE_EDIT_ERRORS = [
     "no text in the message",
@@ -50,6 +51,7 @@ class Manager:
         self.bot: Bot = data.get("bot")
         self.state: FSMContext = data.get("state")
         self.sessionmaker: async_sessionmaker = data.get("sessionmaker")
+        self.segments: Segments = data.get("segments")
 
         self.user: User = data.get("event_from_user")
         self.user_db: UserDB = data.get("user_db")
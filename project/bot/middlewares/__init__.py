@@ -3,6 +3,7 @@ from sulguk import AiogramSulgukMiddleware
 
 from .database import DBSessionMiddleware
 from .manager import ManagerMiddleware
+from .metrics import HandlerMetricsMiddleware, RequestMetricsMiddleware
 from .throttling import ThrottlingMiddleware
 
 
@@ -11,12 +12,20 @@ def bot_middlewares_register(dp: Dispatcher, bot: Bot, **kwargs) -> None:
     Register bot middlewares.
     """
     bot.session.middleware(AiogramSulgukMiddleware())
+    bot.session.middleware(RequestMetricsMiddleware())
 
-    dp.update.outer_middleware.register(DBSessionMiddleware(kwargs["sessionmaker"]))
+    dp.update.outer_middleware.register(DBSessionMiddleware(kwargs["sessionmaker"], kwargs["segments"]))
     dp.update.outer_middleware.register(ThrottlingMiddleware())
     dp.update.outer_middleware.register(ManagerMiddleware())
 
+    # Inner middlewares of the dispatcher apply to the handlers of all included routers
+    for event, observer in dp.observers.items():
+        if event not in ("update", "error"):
+            observer.middleware.register(HandlerMetricsMiddleware(event))
+
 
 __all__ = [
     "bot_middlewares_register",
+    "HandlerMetricsMiddleware",
+    "RequestMetricsMiddleware",
 ]
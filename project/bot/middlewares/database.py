@@ -1,10 +1,13 @@
+import logging
 from typing import Callable, Awaitable, Dict, Any
 
 from aiogram import BaseMiddleware
 from aiogram.types import TelegramObject, User
+from redis.exceptions import RedisError
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from project.db.models import UserDB
+from project.db.segments import Segments
 
 
 class DBSessionMiddleware(BaseMiddleware):
@@ -12,14 +15,16 @@ class DBSessionMiddleware(BaseMiddleware):
     Middleware for handling database sessions.
     """
 
-    def __init__(self, sessionmaker: async_sessionmaker):
+    def __init__(self, sessionmaker: async_sessionmaker, segments: Segments):
         """
         Initialize the DBSessionMiddleware.
 
         :param sessionmaker: The SQLAlchemy sessionmaker object.
+        :param segments: The Segments object, recording the activity of the users.
         """
         super().__init__()
         self.sessionmaker = sessionmaker
+        self.segments = segments
 
     async def __call__(
             self,
@@ -45,6 +50,11 @@ class DBSessionMiddleware(BaseMiddleware):
             )
             # Pass the user_db to the handler function
             data["user_db"] = user_db
+            try:
+                # Update the activity and the segments of the user
+                await self.segments.touch_user(user_db)
+            except RedisError as e:
+                logging.error(f"Failed to update the segments of user {user.id}: {e}")
 
         # Pass the async_sessionmaker to the handler function
         data["sessionmaker"] = self.sessionmaker
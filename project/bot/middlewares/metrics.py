@@ -0,0 +1,116 @@
+import time
+from typing import Any, Awaitable, Callable, Dict, Tuple, Type
+
+from aiogram import BaseMiddleware, Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.dispatcher.event.handler import HandlerObject
+from aiogram.exceptions import (
+    TelegramAPIError,
+    TelegramBadRequest,
+    TelegramConflictError,
+    TelegramEntityTooLarge,
+    TelegramForbiddenError,
+    TelegramMigrateToChat,
+    TelegramNetworkError,
+    TelegramNotFound,
+    TelegramRetryAfter,
+    TelegramServerError,
+    TelegramUnauthorizedError,
+)
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+from aiogram.types import TelegramObject
+
+from project.monitoring.metrics import HANDLER_DURATION, TELEGRAM_REQUEST_DURATION
+
+# Status labels of the errors raised by aiogram for the non-OK responses, checked in order
+ERROR_STATUSES: Tuple[Tuple[Type[TelegramAPIError], str], ...] = (
+    (TelegramNetworkError, "network"),
+    (TelegramRetryAfter, "429"),
+    (TelegramMigrateToChat, "400"),
+    (TelegramBadRequest, "400"),
+    (TelegramUnauthorizedError, "401"),
+    (TelegramForbiddenError, "403"),
+    (TelegramNotFound, "404"),
+    (TelegramConflictError, "409"),
+    (TelegramEntityTooLarge, "413"),
+    (TelegramServerError, "5xx"),
+)
+
+
+def get_error_status(exception: Exception) -> str:
+    """
+    Get the status label of a failed request.
+
+    :param exception: The exception raised by the request.
+    :return: The HTTP status code, "5xx", "network" or "error".
+    """
+    for error_type, status in ERROR_STATUSES:
+        if isinstance(exception, error_type):
+            return status
+    return "error"
+
+
+class RequestMetricsMiddleware(BaseRequestMiddleware):
+    """
+    Bot session middleware for measuring the duration of the Telegram Bot API requests.
+    """
+
+    async def __call__(
+            self,
+            make_request: NextRequestMiddlewareType[TelegramType],
+            bot: Bot,
+            method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        """
+        Call the middleware.
+
+        :param make_request: The next request middleware.
+        :param bot: The Bot object.
+        :param method: The Telegram API method.
+        """
+        started, status = time.perf_counter(), "ok"
+        try:
+            return await make_request(bot, method)
+        except Exception as e:
+            # aiogram raises for every non-OK response
+            status = get_error_status(e)
+            raise
+        finally:
+            TELEGRAM_REQUEST_DURATION.labels(method.__api_method__, status).observe(time.perf_counter() - started)
+
+
+class HandlerMetricsMiddleware(BaseMiddleware):
+    """
+    Inner middleware for measuring the duration of the handlers per router module.
+    """
+
+    def __init__(self, event: str) -> None:
+        """
+        Initialize the HandlerMetricsMiddleware.
+
+        :param event: The name of the observed event type.
+        """
+        self.event = event
+
+    async def __call__(
+            self,
+            handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+            event: TelegramObject,
+            data: Dict[str, Any],
+    ) -> Any:
+        """
+        Call the middleware.
+
+        :param handler: The handler function.
+        :param event: The Telegram event.
+        :param data: Additional data.
+        """
+        handler_object: HandlerObject = data["handler"]
+        router = handler_object.callback.__module__.removeprefix("project.bot.handlers.")
+
+        started = time.perf_counter()
+        try:
+            return await handler(event, data)
+        finally:
+            HANDLER_DURATION.labels(router, self.event).observe(time.perf_counter() - started)
@@ -6,6 +6,8 @@ from aiogram.dispatcher.flags import get_flag
 from aiogram.types import TelegramObject, User
 from cachetools import TTLCache
 
+from project.monitoring.metrics import THROTTLED_UPDATES
+
 
 class ThrottlingMiddleware(BaseMiddleware):
     """
@@ -54,6 +56,7 @@ class ThrottlingMiddleware(BaseMiddleware):
 
             # Check if the user is already throttled for the given key
             if throttling_key and user.id in self.caches[throttling_key]:
+                THROTTLED_UPDATES.labels(throttling_key).inc()
                 # Delete the message if it exists
                 with suppress(Exception):
                     await event.message.delete()
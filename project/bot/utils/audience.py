@@ -0,0 +1,164 @@
+import logging
+from collections import Counter
+from typing import List, Set, Tuple, Union
+
+from aiogram.enums import ChatMemberStatus
+from redis.exceptions import RedisError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from .messages import SendOutcome, SendResult
+from ...db.models import ChatDB, UserDB
+from ...db.segments import Segments
+from ...monitoring.metrics import CHATS_PRUNED
+
+# Outcomes of the sends to chats that can't receive messages anymore
+DEAD_OUTCOMES = (SendOutcome.BLOCKED, SendOutcome.NOT_FOUND)
+# Number of sends whose dead chats are written back to the database at once
+PRUNE_BATCH_SIZE = 100
+# Share of dead chats in a batch with no delivered send that stops the broadcast, most likely
+# a misconfiguration (e.g. the token of another bot) rather than that many chats dying at once
+BREAKER_DEAD_RATIO = 0.5
+# Minimum number of sends in a batch to apply the breaker
+BREAKER_MIN_SENDS = 20
+# Parts of the errors that are specific to the chat, whatever the configuration of the bot
+CHAT_SPECIFIC_ERRORS = ("bot was blocked by the user", "user is deactivated", "bot was kicked")
+
+
+class BroadcastAborted(RuntimeError):
+    """
+    Raised when no send of a batch was delivered and most came back dead.
+    """
+
+
+class AudiencePruner:
+    """
+    Tracks the send results of a broadcast and removes the dead chats from the future audiences.
+
+    A user who blocked the bot or deleted the account is marked as kicked, a group or a channel
+    the bot was kicked from or that doesn't exist anymore gets its broadcast disabled, and both
+    are removed from the audience segments. The dead chats are written back after every batch
+    of sends.
+
+    If no send of a batch was delivered and most came back dead, the broadcast is stopped with
+    BroadcastAborted: only the chats whose error is specific to them (e.g. the bot was blocked by
+    the user) are written back, the others may be dead because of the configuration of the bot.
+    """
+
+    def __init__(
+            self,
+            sessionmaker: async_sessionmaker,
+            source: str,
+            name: Union[str, None] = None,
+            segments: Union[Segments, None] = None,
+            batch_size: int = PRUNE_BATCH_SIZE,
+    ) -> None:
+        """
+        Initialize the AudiencePruner.
+
+        :param sessionmaker: The SQLAlchemy sessionmaker object.
+        :param source: The source of the broadcast for the metrics (weekly_digest, issues, newsletter).
+        :param name: The name of the broadcast for the report, defaults to the source.
+        :param segments: The Segments object, the dead chats are removed from the segments too.
+        :param batch_size: The number of sends whose dead chats are written back at once.
+        """
+        self.sessionmaker = sessionmaker
+        self.source = source
+        self.name = name or source
+        self.segments = segments
+        self.batch_size = batch_size
+        self.outcomes: Counter = Counter()
+        self.pruned: Counter = Counter()
+        self._dead: Set[int] = set()
+        self._pending: List[Tuple[int, SendOutcome, str]] = []
+        self._batch_sends = 0
+        self._batch_delivered = 0
+
+    def is_dead(self, chat_id: int) -> bool:
+        """
+        Check if a send to the chat already failed for good during this broadcast.
+
+        :param chat_id: The ID of the chat.
+        """
+        return chat_id in self._dead
+
+    async def track(self, chat_id: int, result: SendResult) -> None:
+        """
+        Track the result of a send, writing back the dead chats when a batch is full.
+
+        :param chat_id: The ID of the chat.
+        :param result: The result of the send.
+        :raises BroadcastAborted: If most of the sends of the batch came back dead.
+        """
+        self.outcomes[result.outcome] += 1
+        self._batch_sends += 1
+        self._batch_delivered += result.delivered
+        if result.outcome in DEAD_OUTCOMES and chat_id not in self._dead:
+            self._dead.add(chat_id)
+            self._pending.append((chat_id, result.outcome, getattr(result.error, "message", "")))
+        if self._batch_sends >= self.batch_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """
+        Write back the dead chats of the current batch.
+
+        :raises BroadcastAborted: If no send of the batch was delivered and most came back dead.
+        """
+        pending, self._pending = self._pending, []
+        sends, self._batch_sends = self._batch_sends, 0
+        delivered, self._batch_delivered = self._batch_delivered, 0
+        if not pending:
+            return
+        if sends >= BREAKER_MIN_SENDS and not delivered and len(pending) > sends * BREAKER_DEAD_RATIO:
+            await self._prune([
+                (chat_id, outcome) for chat_id, outcome, error in pending
+                if any(part in error for part in CHAT_SPECIFIC_ERRORS)
+            ])
+            message = (f"Broadcast {self.name} stopped: none of {sends} sends was delivered and {len(pending)} "
+                       f"came back dead, only the chats that blocked the bot are pruned. {self.report()}")
+            logging.error(message)
+            raise BroadcastAborted(message)
+        await self._prune([(chat_id, outcome) for chat_id, outcome, _ in pending])
+
+    async def _prune(self, pending: List[Tuple[int, SendOutcome]]) -> None:
+        """
+        Write back the dead chats to the database and remove them from the segments.
+
+        :param pending: The IDs of the dead chats with the outcomes of their sends.
+        """
+        if not pending:
+            return
+        ids = [chat_id for chat_id, _ in pending]
+        try:
+            await UserDB.update_state(self.sessionmaker, ids, ChatMemberStatus.KICKED)
+            await ChatDB.disable_broadcast(self.sessionmaker, ids)
+        except SQLAlchemyError as e:
+            logging.error(f"Failed to prune {len(ids)} chats of {self.name}: {e}")
+            return
+        if self.segments is not None:
+            try:
+                await self.segments.remove(ids)
+            except RedisError as e:
+                # The segments are rebuilt from the database daily
+                logging.error(f"Failed to remove {len(ids)} chats of {self.name} from the segments: {e}")
+        for _, outcome in pending:
+            self.pruned[outcome] += 1
+            CHATS_PRUNED.labels(self.source, outcome.value).inc()
+
+    async def close(self) -> None:
+        """
+        Write back the dead chats of the last batch and log the report of the broadcast.
+
+        :raises BroadcastAborted: If no send of the last batch was delivered and most came back dead.
+        """
+        await self.flush()
+        logging.info(self.report())
+
+    def report(self) -> str:
+        """
+        Get the report of the broadcast: the number of sends per outcome and of pruned chats.
+        """
+        outcomes = ", ".join(f"{self.outcomes[outcome]} {outcome.value}" for outcome in SendOutcome)
+        pruned = ", ".join(f"{self.pruned[outcome]} {outcome.value}" for outcome in DEAD_OUTCOMES)
+        return f"Broadcast {self.name}: {outcomes}; pruned {sum(self.pruned.values())} chats ({pruned})."
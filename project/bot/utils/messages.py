@@ -1,11 +1,146 @@
 import asyncio
-from typing import Union
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Awaitable, Callable, Union
 
 from aiogram import Bot
-from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
+from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError, TelegramRetryAfter
 from aiogram.types import InlineKeyboardMarkup as Markup, BufferedInputFile, Message
 from sulguk import SULGUK_PARSE_MODE
 
+from .texts.messages import PreviewPhoto, insert_hidden_link
+from ...monitoring.metrics import TELEGRAM_FLOOD_WAIT, TELEGRAM_SENDS
+
+# Number of times a send is retried after a flood wait
+SEND_RETRIES = 3
+# Descriptions of the errors answered for a chat that doesn't exist anymore
+NOT_FOUND_DESCRIPTIONS = ("Bad Request: chat not found", "Bad Request: user not found")
+
+
+class SendOutcome(str, Enum):
+    """
+    Outcome of a message send.
+    """
+    SENT = "sent"
+    RETRIED = "retried"
+    BLOCKED = "blocked"
+    NOT_FOUND = "not_found"
+    FAILED = "failed"
+
+
+@dataclass
+class SendResult:
+    """
+    Result of a message send.
+
+    :param outcome: The outcome, RETRIED if sent after one or more flood waits.
+    :param message: The sent message or None if not sent.
+    :param retries: The number of retries.
+    :param error: The error of the last attempt or None if sent.
+    """
+    outcome: SendOutcome
+    message: Union[Message, None] = None
+    retries: int = 0
+    error: Union[Exception, None] = None
+
+    @property
+    def delivered(self) -> bool:
+        return self.outcome in (SendOutcome.SENT, SendOutcome.RETRIED)
+
+
+class FloodWait:
+    """
+    Flood wait shared by all the senders of the process.
+
+    Telegram limits the bot as a whole, so when a send is answered with a flood wait
+    all the senders pause until it ends instead of only the one that hit it.
+
+    The pause is per process: with APP_SCHEDULER_MODE=worker, the sends of the app
+    (e.g. the newsletter previews) don't pause for the flood waits hit by the worker.
+    """
+
+    def __init__(self) -> None:
+        self._until = 0.0
+
+    def pause(self, seconds: float) -> None:
+        """
+        Pause the senders for the given number of seconds (from now).
+
+        :param seconds: The duration of the flood wait.
+        """
+        now = time.monotonic()
+        until = now + seconds
+        if until > self._until:
+            # Concurrent senders hit the same flood wait, count only how far the pause is extended
+            TELEGRAM_FLOOD_WAIT.inc(until - max(self._until, now))
+            self._until = until
+
+    async def wait(self) -> None:
+        """
+        Wait for the end of the flood wait, if any.
+        """
+        while (delay := self._until - time.monotonic()) > 0:
+            await asyncio.sleep(delay)
+
+
+flood_wait = FloodWait()
+
+
+def get_send_outcome(exception: Exception) -> SendOutcome:
+    """
+    Get the outcome of a failed message send.
+
+    :param exception: The exception raised by the send.
+    :return: The outcome (blocked, not_found or failed).
+    """
+    if isinstance(exception, TelegramForbiddenError):
+        # The bot was blocked by the user, kicked from the chat, or the user is deactivated
+        return SendOutcome.BLOCKED
+    if isinstance(exception, TelegramBadRequest) and exception.message in NOT_FOUND_DESCRIPTIONS:
+        return SendOutcome.NOT_FOUND
+    # Including 404 Not Found, answered for a wrong token or Bot API server, not for a chat
+    return SendOutcome.FAILED
+
+
+async def send_with_retries(
+        send: Callable[[], Awaitable[Message]],
+        source: str,
+        retries: int = SEND_RETRIES,
+) -> SendResult:
+    """
+    Send a message, retrying it after flood waits.
+
+    Only flood waits are retried: Telegram didn't process these requests, while a network
+    or server error may hide a message that was actually sent.
+
+    :param send: The coroutine function sending the message, called once per attempt.
+    :param source: The source of the send for the metrics (send_message, newsletter).
+    :param retries: The maximum number of retries.
+    :return: The result of the send.
+    """
+    attempt = 0
+    while True:
+        await flood_wait.wait()
+        try:
+            message = await send()
+        except TelegramRetryAfter as e:
+            flood_wait.pause(e.retry_after)
+            if attempt == retries:
+                result = SendResult(SendOutcome.FAILED, retries=attempt, error=e)
+                break
+            attempt += 1
+        except Exception as e:
+            result = SendResult(get_send_outcome(e), retries=attempt, error=e)
+            break
+        else:
+            outcome = SendOutcome.RETRIED if attempt else SendOutcome.SENT
+            result = SendResult(outcome, message=message, retries=attempt)
+            break
+
+    TELEGRAM_SENDS.labels(source, result.outcome.value).inc()
+    return result
+
 
 async def send_message(
         bot: Bot,
@@ -13,32 +148,52 @@ async def send_message(
         text: Union[str, None] = None,
         document: Union[BufferedInputFile, None] = None,
         reply_markup: Union[Markup, None] = None,
-) -> Union[Message, None]:
-    try:
-        await asyncio.sleep(0.05)
-        if document:
-            message = await bot.send_document(
+        preview: Union[PreviewPhoto, None] = None,
+) -> SendResult:
+    if preview and not preview.fits(text):
+        # Too long for a caption, the preview is shown with a hidden link instead
+        text, preview = insert_hidden_link(text, preview.url), None
+
+    async def send() -> Message:
+        if preview and preview.enabled:
+            try:
+                return await bot.send_photo(
+                    chat_id=chat_id,
+                    photo=preview.photo,
+                    caption=text,
+                    reply_markup=reply_markup,
+                    parse_mode=SULGUK_PARSE_MODE,
+                )
+            except TelegramBadRequest as e:
+                if e.message in NOT_FOUND_DESCRIPTIONS:
+                    raise
+                # Telegram failed to fetch the preview, rejected its file_id, or the chat
+                # doesn't allow photos: the message is sent with a hidden link instead
+                preview.reject(e.message)
+        if preview:
+            return await bot.send_message(
                 chat_id=chat_id,
-                document=document,
-                caption=text,
+                text=insert_hidden_link(text, preview.url),
                 reply_markup=reply_markup,
                 parse_mode=SULGUK_PARSE_MODE,
             )
-        else:
-            message = await bot.send_message(
+        if document:
+            return await bot.send_document(
                 chat_id=chat_id,
-                text=text,
+                document=document,
+                caption=text,
                 reply_markup=reply_markup,
                 parse_mode=SULGUK_PARSE_MODE,
             )
-        return message
-
-    except TelegramRetryAfter as e:
-        # If rate limited, wait and try again
-        await asyncio.sleep(e.retry_after)
-        await send_message(bot, chat_id, text, document, reply_markup)
-    except (TelegramBadRequest, Exception):
-        # If chat is not found, or bot is blocked, or any other error, skip.
-        pass
+        return await bot.send_message(
+            chat_id=chat_id,
+            text=text,
+            reply_markup=reply_markup,
+            parse_mode=SULGUK_PARSE_MODE,
+        )
 
-    return None
+    await asyncio.sleep(0.05)
+    result = await send_with_retries(send, "send_message")
+    if preview and result.message and result.message.photo:
+        await preview.save(result.message)
+    return result
@@ -1,5 +1,11 @@
+import logging
+from typing import Tuple, Union
+
+from aiogram.types import Message
 from aiogram.utils.markdown import hide_link
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import async_sessionmaker
+from sulguk import transform_html
 
 from project.db.models import TextMessageDB
 from ._init_value import InitValue
@@ -21,25 +27,130 @@ class MessageCode(InitValue):
     TOP_CONTRIBUTORS: str
 
 
+# Maximum length of a photo caption
+CAPTION_LENGTH = 1024
+# Parts of the errors answered when Telegram fails to fetch the preview or rejects its file_id
+PHOTO_ERRORS = ("file identifier", "HTTP URL", "web page content", "IMAGE_PROCESS_FAILED", "PHOTO_")
+
+
+def insert_hidden_link(text: str, url: str) -> str:
+    """
+    Insert a hidden link to the URL after the first tag of the text, Telegram shows its preview.
+
+    :param text: The HTML text.
+    :param url: The URL of the preview.
+    """
+    tag_index = text.find('>')
+    return text[:tag_index + 1] + hide_link(url) + text[tag_index + 1:]
+
+
+class PreviewPhoto:
+    """
+    Preview of a text message sent as a photo instead of a link preview.
+
+    The first send passes the preview URL, fetched by Telegram, and the returned file_id
+    is saved and reused by the next sends until the admin changes the preview URL.
+    If Telegram fails to fetch the URL, the preview is sent as a hidden link for the rest
+    of the broadcast.
+    """
+
+    def __init__(self, sessionmaker: async_sessionmaker, message: TextMessageDB) -> None:
+        """
+        Initialize the PreviewPhoto object.
+
+        :param sessionmaker: An async_sessionmaker object for database operations.
+        :param message: The text message with a preview URL.
+        """
+        self.sessionmaker = sessionmaker
+        self.code = message.code
+        self.url = message.preview_url
+        self.file_id = message.preview_file_id
+        self.enabled = True
+
+    @property
+    def photo(self) -> str:
+        """Get the photo to send: the file_id, or the URL until it is resolved."""
+        return self.file_id or self.url
+
+    @staticmethod
+    def fits(caption: str) -> bool:
+        """
+        Check if the HTML text fits into a photo caption.
+
+        :param caption: The HTML text.
+        """
+        return len(transform_html(caption).text.strip()) <= CAPTION_LENGTH
+
+    def reject(self, error: str) -> None:
+        """
+        Handle the error of a send with the preview photo.
+
+        A rejected file_id is resolved from the URL again by the next send, a URL Telegram
+        failed to fetch disables the photo, the next sends use a hidden link.
+
+        :param error: The description of the error.
+        """
+        if not any(part in error for part in PHOTO_ERRORS):
+            # An error of the chat (e.g. no right to send photos), not of the preview
+            return
+        if self.file_id:
+            self.file_id = None
+        else:
+            self.enabled = False
+            logging.warning(f"Failed to send the preview of {self.code} as a photo: {error}")
+
+    async def save(self, message: Message) -> None:
+        """
+        Save the file_id of the photo of the sent message, if not saved yet.
+
+        :param message: The sent message.
+        """
+        if self.file_id or not message.photo:
+            return
+        self.file_id = message.photo[-1].file_id
+        try:
+            await TextMessageDB.set_preview_file_id(self.sessionmaker, self.code, self.url, self.file_id)
+        except SQLAlchemyError as e:
+            # The file_id is still reused by the next sends of this broadcast
+            logging.error(f"Failed to save the preview file_id of {self.code}: {e}")
+
+
 class TextMessage:
     """
     Class representing a text message.
     """
 
-    def __init__(self, sessionmaker: async_sessionmaker) -> None:
+    def __init__(self, sessionmaker: async_sessionmaker, preview_photos: bool = False) -> None:
         """
         Initialize the TextMessage object.
 
         :param sessionmaker: An async_sessionmaker object for database operations.
+        :param preview_photos: Whether the previews are sent as photos instead of hidden links.
         """
         self.sessionmaker = sessionmaker
+        self.preview_photos = preview_photos
 
     async def get(self, code: str) -> str:
         message = await TextMessageDB.get(self.sessionmaker, code)
 
         if message.preview_url:
-            tag_index = message.text.find('>')
-            hidden_link = hide_link(message.preview_url)
-            return message.text[:tag_index + 1] + hidden_link + message.text[tag_index + 1:]
+            return insert_hidden_link(message.text, message.preview_url)
 
         return message.text
+
+    async def get_with_preview(self, code: str) -> Tuple[str, Union[PreviewPhoto, None]]:
+        """
+        Get the text of a message and its preview photo, if the previews are sent as photos.
+
+        :param code: The code of the message.
+        :return: The text without the hidden link and the preview photo, or the text with
+            the hidden link and None.
+        """
+        message = await TextMessageDB.get(self.sessionmaker, code)
+
+        if message.preview_url and self.preview_photos:
+            return message.text, PreviewPhoto(self.sessionmaker, message)
+        if message.preview_url:
+            return insert_hidden_link(message.text, message.preview_url), None
+
+        return message.text, None
@@ -0,0 +1,9 @@
+from .decoder import decode_update
+from .dedup import UpdateDeduplicator
+from .queue import UpdateQueue
+
+__all__ = [
+    "decode_update",
+    "UpdateDeduplicator",
+    "UpdateQueue",
+]
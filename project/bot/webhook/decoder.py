@@ -0,0 +1,20 @@
+from typing import Any, Dict
+
+import orjson
+
+
+def decode_update(body: bytes) -> Dict[str, Any]:
+    """
+    Decode the raw webhook request body into an update.
+
+    The body is parsed once with a fast JSON parser, the update model itself
+    is validated later, when the update is fed to the dispatcher.
+
+    :param body: The raw request body.
+    :return: The update as a dictionary.
+    :raises ValueError: If the body is not a JSON object with an integer update_id.
+    """
+    update = orjson.loads(body)
+    if not isinstance(update, dict) or not isinstance(update.get("update_id"), int):
+        raise ValueError("Body is not a Telegram update.")
+    return update
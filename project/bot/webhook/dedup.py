@@ -0,0 +1,98 @@
+import logging
+from array import array
+from typing import Union
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+# Redis key claiming an update ID for the process that received it first
+UPDATE_KEY = "update:{}"
+# Time-to-live in seconds of the claims, Telegram keeps the unconfirmed updates for up to 24 hours
+UPDATE_TTL = 24 * 60 * 60
+
+
+class UpdateDeduplicator:
+    """
+    Deduplicator of the update IDs received by the webhook.
+
+    Keeps the last `size` update IDs in a fixed-size ring buffer with a set for O(1) lookups,
+    so updates retried by Telegram can be acknowledged without processing them again.
+    The ring buffer is per process, the update IDs are also claimed in Redis
+    (SET NX EX) so that a retry reaching another process is recognized as well.
+    """
+
+    def __init__(self, redis: Union[Redis, None] = None, size: int = 10_000, ttl: int = UPDATE_TTL) -> None:
+        """
+        Initialize the UpdateDeduplicator.
+
+        :param redis: The Redis object, only the ring buffer is checked if None.
+        :param size: The number of most recent update IDs to remember in the process.
+        :param ttl: The time-to-live in seconds of the claims in Redis.
+        """
+        self.redis = redis
+        self.ttl = ttl
+        self._ring = array("q", [-1]) * size
+        self._seen = set()
+        self._index = 0
+        self.duplicates = 0
+
+    def __contains__(self, update_id: int) -> bool:
+        """
+        Check if the update ID was seen recently by the process.
+
+        :param update_id: The update ID.
+        :return: True if the update ID is in the window, False otherwise.
+        """
+        return update_id in self._seen
+
+    async def claim(self, update_id: int) -> bool:
+        """
+        Claim the update ID, counting it as a duplicate if it was seen already.
+
+        The ring buffer is checked first, then the update ID is claimed in Redis.
+        If Redis is unavailable, the update is accepted rather than lost.
+
+        :param update_id: The update ID.
+        :return: True if the update is new, False if it is a duplicate.
+        """
+        if update_id in self._seen:
+            self.duplicates += 1
+            return False
+        if self.redis is None:
+            return True
+        try:
+            claimed = await self.redis.set(UPDATE_KEY.format(update_id), 1, nx=True, ex=self.ttl)
+        except RedisError as e:
+            logging.warning(f"Failed to claim update {update_id}: {e}")
+            return True
+        if not claimed:
+            self.add(update_id)
+            self.duplicates += 1
+            return False
+        return True
+
+    async def release(self, update_id: int) -> None:
+        """
+        Release the claim of an update that was not accepted, so that its retry is processed.
+
+        :param update_id: The update ID.
+        """
+        if self.redis is None:
+            return
+        try:
+            await self.redis.delete(UPDATE_KEY.format(update_id))
+        except RedisError as e:
+            logging.warning(f"Failed to release update {update_id}: {e}")
+
+    def add(self, update_id: int) -> None:
+        """
+        Add the update ID to the window, evicting the oldest one.
+
+        :param update_id: The update ID.
+        """
+        if update_id in self._seen:
+            return
+        self._seen.discard(self._ring[self._index])
+        self._ring[self._index] = update_id
+        self._seen.add(update_id)
+        self._index = (self._index + 1) % len(self._ring)
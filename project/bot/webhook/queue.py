@@ -0,0 +1,150 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Union
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update
+
+from ...monitoring.metrics import WEBHOOK_UPDATES
+
+
+class UpdateQueue:
+    """
+    Bounded in-process queue of webhook updates drained by a pool of workers.
+
+    Updates are sharded across workers by chat ID, so updates of the same chat are processed
+    in the order they were received, while different chats are processed concurrently.
+
+    Delivery is at-most-once: the updates are acknowledged to Telegram as soon as they are queued,
+    so the updates still queued when the process stops (see `stop`) or crashes are lost.
+    The ordering holds within the process only, the app is run as a single process.
+    """
+
+    def __init__(
+            self,
+            dp: Dispatcher,
+            bot: Bot,
+            workers: int = 8,
+            maxsize: int = 1000,
+    ) -> None:
+        """
+        Initialize the UpdateQueue.
+
+        :param dp: The Dispatcher object.
+        :param bot: The Bot object.
+        :param workers: The number of workers.
+        :param maxsize: The maximum number of queued updates per worker.
+        """
+        self.dp = dp
+        self.bot = bot
+        self.queues: List[asyncio.Queue] = [asyncio.Queue(maxsize=maxsize) for _ in range(workers)]
+        self.tasks: List[asyncio.Task] = []
+
+        # Counters for backpressure monitoring
+        self.received = 0
+        self.rejected = 0
+        self.processed = 0
+        self.failed = 0
+
+    @staticmethod
+    def get_chat_id(update: Dict[str, Any]) -> int:
+        """
+        Get the ID of the chat (or the user) the update belongs to.
+
+        :param update: The raw update.
+        :return: The chat ID, or the update ID if the update has no chat.
+        """
+        for value in update.values():
+            if not isinstance(value, dict):
+                continue
+            chat = value.get("chat") or (value.get("message") or {}).get("chat")
+            if chat:
+                return chat["id"]
+            user = value.get("from") or value.get("user")
+            if user:
+                return user["id"]
+        return update.get("update_id", 0)
+
+    def put(self, update: Dict[str, Any]) -> bool:
+        """
+        Enqueue the update without waiting.
+
+        :param update: The raw update.
+        :return: True if the update was enqueued, False if the queue of its chat is full.
+        """
+        queue = self.queues[self.get_chat_id(update) % len(self.queues)]
+        try:
+            queue.put_nowait(update)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            WEBHOOK_UPDATES.labels("rejected").inc()
+            logging.warning(f"Update queue is full, update {update.get('update_id')} rejected.")
+            return False
+        self.received += 1
+        WEBHOOK_UPDATES.labels("received").inc()
+        return True
+
+    def metrics(self) -> Dict[str, Union[int, List[int]]]:
+        """
+        Get the queue metrics.
+
+        :return: The dictionary with counters and the current size of each worker queue.
+        """
+        return {
+            "received": self.received,
+            "rejected": self.rejected,
+            "processed": self.processed,
+            "failed": self.failed,
+            "sizes": [queue.qsize() for queue in self.queues],
+        }
+
+    async def _process(self, update: Dict[str, Any]) -> None:
+        """
+        Validate the update model and feed it to the dispatcher.
+
+        :param update: The raw update.
+        """
+        await self.dp.feed_update(bot=self.bot, update=Update.model_validate(update, context={"bot": self.bot}))
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        """
+        Drain the queue, processing updates one by one.
+
+        :param queue: The queue of the worker.
+        """
+        while True:
+            update = await queue.get()
+            try:
+                await self._process(update)
+                self.processed += 1
+                WEBHOOK_UPDATES.labels("processed").inc()
+            except Exception as e:
+                self.failed += 1
+                WEBHOOK_UPDATES.labels("failed").inc()
+                logging.exception(f"Update: {update.get('update_id')}\nException: {e}")
+            finally:
+                queue.task_done()
+
+    def start(self) -> None:
+        """
+        Start the workers.
+        """
+        self.tasks = [asyncio.create_task(self._worker(queue)) for queue in self.queues]
+
+    async def stop(self, timeout: float = 10) -> None:
+        """
+        Wait for the queued updates to be processed and stop the workers.
+
+        The updates left in the queues after the timeout are dropped, Telegram won't resend them.
+
+        :param timeout: The maximum time in seconds to wait for the queues to drain.
+        """
+        try:
+            await asyncio.wait_for(asyncio.gather(*[queue.join() for queue in self.queues]), timeout)
+        except asyncio.TimeoutError:
+            dropped = sum(queue.qsize() for queue in self.queues)
+            logging.warning(f"Update queue was not drained in {timeout} seconds, {dropped} updates dropped.")
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from pathlib import Path
 
+from aiogram.client.telegram import TelegramAPIServer, PRODUCTION
 from environs import Env
 
 BASE_DIR = Path(__file__).resolve().parent
@@ -17,6 +18,17 @@ class BotConfig:
     USERNAME: str
     DEV_ID: int
     ADMIN_ID: int
+    API_URL: str
+    PREVIEW_PHOTOS: bool
+
+    def api_server(self) -> TelegramAPIServer:
+        """
+        Returns the Telegram Bot API server to use: the official one, or a self-hosted or stub server
+        if API_URL is set.
+
+        :return: The Bot API server.
+        """
+        return TelegramAPIServer.from_base(self.API_URL) if self.API_URL else PRODUCTION
 
 
 @dataclass
@@ -24,6 +36,9 @@ class AppConfig:
     URL: str
     HOST: str
     PORT: int
+    SCHEDULER_MODE: str
+    METRICS_PORT: int
+    WORKER_METRICS_PORT: int
 
 
 @dataclass
@@ -79,6 +94,14 @@ class GitHubConfig:
     TOKEN: str
     OWNER: str
     REPO: str
+    WEBHOOK_SECRET: str
+
+
+@dataclass
+class SchedulerConfig:
+    SYNC_MIN_INTERVAL: int
+    SYNC_MAX_INTERVAL: int
+    SYNC_RECONCILE_INTERVAL: int
 
 
 @dataclass
@@ -90,6 +113,7 @@ class Config:
     redis: RedisConfig
     database: DatabaseConfig
     github: GitHubConfig
+    scheduler: SchedulerConfig
 
     TONAPI_KEY: str
 
@@ -104,11 +128,16 @@ def load_config() -> Config:
             USERNAME=env.str("BOT_USERNAME"),
             DEV_ID=env.int("BOT_DEV_ID"),
             ADMIN_ID=env.int("BOT_ADMIN_ID"),
+            API_URL=env.str("BOT_API_URL", ""),
+            PREVIEW_PHOTOS=env.bool("BOT_PREVIEW_PHOTOS", False),
         ),
         app=AppConfig(
             URL=env.str("APP_URL"),
             HOST=env.str("APP_HOST"),
             PORT=env.int("APP_PORT"),
+            SCHEDULER_MODE=env.str("APP_SCHEDULER_MODE", "app"),
+            METRICS_PORT=env.int("APP_METRICS_PORT", 9100),
+            WORKER_METRICS_PORT=env.int("APP_WORKER_METRICS_PORT", 9101),
         ),
         admin=AdminConfig(
             BASE_URL="/",
@@ -137,6 +166,12 @@ def load_config() -> Config:
             TOKEN=env.str("GITHUB_TOKEN"),
             OWNER=env.str("GITHUB_OWNER"),
             REPO=env.str("GITHUB_REPO"),
+            WEBHOOK_SECRET=env.str("GITHUB_WEBHOOK_SECRET", ""),
+        ),
+        scheduler=SchedulerConfig(
+            SYNC_MIN_INTERVAL=env.int("SCHEDULER_SYNC_MIN_INTERVAL", 30),
+            SYNC_MAX_INTERVAL=env.int("SCHEDULER_SYNC_MAX_INTERVAL", 600),
+            SYNC_RECONCILE_INTERVAL=env.int("SCHEDULER_SYNC_RECONCILE_INTERVAL", 900),
         ),
         TONAPI_KEY=env.str("TONAPI_KEY"),
     )
@@ -1,4 +1,4 @@
-from ._base import Base
+from ._base import Base, iter_ids
 
 from .admin import AdminDB
 from .chat import ChatDB
@@ -10,6 +10,7 @@ from .user import UserDB
 
 __all__ = [
     "Base",
+    "iter_ids",
 
     "AdminDB",
     "ChatDB",
@@ -1,7 +1,47 @@
+from typing import Any, AsyncIterator
+
+from sqlalchemy import Column, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 
+# Number of ids read per query by the audience iterators
+ITER_BATCH_SIZE = 1000
+
 
 class Base(DeclarativeBase):
     """
     Base class for SQLAlchemy models.
     """
+
+
+async def iter_ids(
+        sessionmaker: async_sessionmaker,
+        column: Column,
+        *filters: Any,
+        batch_size: int = ITER_BATCH_SIZE,
+) -> AsyncIterator[int]:
+    """
+    Iterate over the values of a unique column in ascending order, reading them in batches.
+
+    Each batch is read with its own short session (keyset pagination on the column), so memory
+    stays constant and no connection is held while the consumer is sending messages.
+
+    :param sessionmaker: The SQLAlchemy sessionmaker object.
+    :param column: The unique column to iterate over (the primary key).
+    :param filters: The filters of the query.
+    :param batch_size: The number of values read per query.
+    """
+    last = None
+    while True:
+        async with sessionmaker() as session:
+            query = select(column).where(*filters).order_by(column).limit(batch_size)
+            if last is not None:
+                query = query.where(column > last)
+            result = await session.execute(query)
+            values = result.scalars().all()
+
+        for value in values:
+            yield value
+        if len(values) < batch_size:
+            return
+        last = values[-1]
@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-from typing import List, Union
+from typing import AsyncIterator, List, Union
 
 from aiogram.enums import ChatMemberStatus
 from sqlalchemy import *
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
-from . import Base
+from ._base import Base, iter_ids
 
 
 class ChatDB(Base):
@@ -101,38 +101,39 @@ class ChatDB(Base):
             return result.scalar()
 
     @classmethod
-    async def get_ids(
+    def iter_ids(
             cls: ChatDB,
             sessionmaker: async_sessionmaker,
             chat_type: str,
-    ) -> List[int, None]:
-        """Get all ids from the database filtered by chat type."""
+    ) -> AsyncIterator[int]:
+        """Iterate over the ids of the broadcast chats filtered by chat type, in batches."""
+        return iter_ids(sessionmaker, cls.id, cls.type == chat_type, cls.broadcast.is_(True))
+
+    @classmethod
+    async def disable_broadcast(
+            cls: ChatDB,
+            sessionmaker: async_sessionmaker,
+            ids: List[int],
+    ) -> int:
+        """Disable the broadcast of the records with the given ids."""
         async with sessionmaker() as session:
-            query = select(cls.id).where(and_(cls.type == chat_type))
+            query = update(cls).where(cls.id.in_(ids)).values(broadcast=False)
             result = await session.execute(query)
-            return result.scalars().all()  # type: ignore
+            await session.commit()
+            return result.rowcount
 
     @classmethod
-    async def get_all_ids(
+    async def iter_all_ids(
             cls: ChatDB,
             sessionmaker: async_sessionmaker,
-    ) -> List[int, None]:
-        """Get all ids from the database."""
+    ) -> AsyncIterator[int]:
+        """Iterate over the ids of all the broadcast chats and users, in batches."""
         from .user import UserDB
 
-        async with sessionmaker() as session:
-            query = (
-                select(ChatDB.id)
-                .where(ChatDB.broadcast.is_(True))
-                .union_all(
-                    select(UserDB.id)
-                    .where(
-                        and_(
-                            UserDB.broadcast.is_(True),
-                            UserDB.state == ChatMemberStatus.MEMBER,
-                        )
-                    )
-                )
-            )
-            result = await session.execute(query)
-            return result.scalars().all()  # type: ignore
+        async for chat_id in iter_ids(sessionmaker, cls.id, cls.broadcast.is_(True)):
+            yield chat_id
+        async for user_id in iter_ids(
+                sessionmaker, UserDB.id,
+                UserDB.broadcast.is_(True), UserDB.state == ChatMemberStatus.MEMBER,
+        ):
+            yield user_id
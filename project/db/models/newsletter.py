@@ -27,6 +27,11 @@ class NewsletterDB(Base):
             validators=[SizeValidator("10M")],
         )
     )
+    image_file_id = Column(
+        VARCHAR(255),
+        nullable=True,
+        default=None,
+    )
     content = Column(
         VARCHAR(4096),
         nullable=False,
@@ -41,6 +46,11 @@ class NewsletterDB(Base):
         nullable=False,
         default="all",
     )
+    segment = Column(
+        VARCHAR(255),
+        nullable=True,
+        default=None,
+    )
     start_date = Column(
         DateTime,
         nullable=True,
@@ -31,6 +31,11 @@ class TextMessageDB(Base):
         VARCHAR(length=2048),
         nullable=True,
     )
+    preview_file_id = Column(
+        VARCHAR(length=255),
+        nullable=True,
+        default=None,
+    )
 
     __tablename__ = "text_messages"
     __admin_icon__ = "fa-solid fa-message"
@@ -62,3 +67,20 @@ class TextMessageDB(Base):
             session.add(instance)
             await session.commit()
             return instance
+
+    @classmethod
+    async def set_preview_file_id(
+            cls: TextMessageDB,
+            sessionmaker: async_sessionmaker,
+            code: str,
+            preview_url: str,
+            file_id: Union[str, None],
+    ) -> int:
+        """Set the file_id of the preview photo, unless the preview URL changed in the meantime."""
+        async with sessionmaker() as session:
+            query = update(cls).where(
+                and_(cls.code == code, cls.preview_url == preview_url)
+            ).values(preview_file_id=file_id)
+            result = await session.execute(query)
+            await session.commit()
+            return result.rowcount
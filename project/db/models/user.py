@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-from typing import Union, List
+from typing import AsyncIterator, Union, List
 
 from aiogram.enums import ChatMemberStatus
 from sqlalchemy import *
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
-from . import Base
+from ._base import Base, iter_ids
 
 
 class UserDB(Base):
@@ -100,18 +100,26 @@ class UserDB(Base):
         return await cls.create(sessionmaker, **kwargs)
 
     @classmethod
-    async def get_all_ids(
+    def iter_all_ids(
             cls,
             sessionmaker: async_sessionmaker,
-    ) -> List[int]:
-        """Get all ids from the database."""
+    ) -> AsyncIterator[int]:
+        """Iterate over all ids from the database, in batches."""
+        return iter_ids(sessionmaker, cls.id, cls.state == ChatMemberStatus.MEMBER)
+
+    @classmethod
+    async def update_state(
+            cls,
+            sessionmaker: async_sessionmaker,
+            ids: List[int],
+            state: str,
+    ) -> int:
+        """Update the state of the records with the given ids."""
         async with sessionmaker() as session:
-            query = (
-                select(cls.id)
-                .where(and_(cls.state == ChatMemberStatus.MEMBER))
-            )
+            query = update(cls).where(cls.id.in_(ids)).values(state=state)
             result = await session.execute(query)
-            return result.scalars().all()  # type: ignore
+            await session.commit()
+            return result.rowcount
 
     async def __admin_repr__(self, _) -> str:
         """
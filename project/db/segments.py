@@ -0,0 +1,297 @@
+import re
+import time
+from typing import AsyncIterator, Dict, Iterable, List, Tuple, Union
+from uuid import uuid4
+
+from aiogram.enums import ChatMemberStatus, ChatType
+from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from .models import AdminDB, ChatDB, UserDB, iter_ids
+
+# Redis key prefix of the audience segments
+SEGMENTS_KEY = "segments:"
+# Set of the users that didn't block the bot
+USERS_KEY = SEGMENTS_KEY + "users"
+# Set of the users that didn't block the bot and subscribed to the notifications
+SUBSCRIBED_KEY = SEGMENTS_KEY + "subscribed"
+# Set of the admins
+ADMINS_KEY = SEGMENTS_KEY + "admins"
+# Sets of the groups (and supergroups) and of the channels with broadcast enabled
+GROUPS_KEY = SEGMENTS_KEY + "groups"
+CHANNELS_KEY = SEGMENTS_KEY + "channels"
+# Sorted set of the users by the time of their last update
+ACTIVE_KEY = SEGMENTS_KEY + "active"
+# Sorted set of the chats by their number of members
+CHAT_MEMBERS_KEY = SEGMENTS_KEY + "chat_members"
+# Redis key prefix of the temporary keys of the evaluated segments
+TMP_KEY = SEGMENTS_KEY + "tmp:"
+# Time-to-live in seconds of the temporary keys, if not deleted after use
+TMP_TTL = 60 * 60
+# Activity older than this number of days is dropped
+ACTIVE_RETENTION_DAYS = 90
+# Number of ids read or written per Redis command
+BATCH_SIZE = 1000
+
+# Segments stored as they are
+BASE_SEGMENTS = {
+    "users": USERS_KEY,
+    "subscribed": SUBSCRIBED_KEY,
+    "admins": ADMINS_KEY,
+    "groups": GROUPS_KEY,
+    "channels": CHANNELS_KEY,
+}
+# Segments computed from the base ones or from the sorted sets
+ACTIVE_SEGMENT = re.compile(r"^active_(\d+)d$")
+MEMBERS_SEGMENT = re.compile(r"^members_(\d+)$")
+OPERATORS = {"|": "union", "&": "inter", "-": "diff"}
+
+
+class SegmentError(ValueError):
+    """
+    Raised when a segment expression is invalid.
+    """
+
+
+def parse_segment(expression: str) -> List[Tuple[str, str]]:
+    """
+    Parse a segment expression: segment names combined with | (union), & (intersection)
+    and - (difference), evaluated from left to right.
+
+    Segments: users, subscribed, admins, groups, channels, chats (groups | channels),
+    active_<N>d (users active in the last N days) and members_<M> (chats with at least M members).
+
+    :param expression: The expression, e.g. "active_30d & subscribed - admins".
+    :return: List of (operator, segment) pairs, the operator of the first one is "|".
+    :raises SegmentError: If the expression is invalid.
+    """
+    tokens = re.split(r"\s*([|&-])\s*", expression.strip())
+    if not tokens or len(tokens) % 2 == 0:
+        raise SegmentError(f"Invalid segment expression: {expression!r}.")
+
+    parsed = []
+    for operator, name in zip(["|"] + tokens[1::2], tokens[0::2]):
+        if name not in BASE_SEGMENTS and name != "chats" and not (
+                ACTIVE_SEGMENT.match(name) or MEMBERS_SEGMENT.match(name)
+        ):
+            raise SegmentError(f"Unknown segment: {name!r}.")
+        parsed.append((operator, name))
+    return parsed
+
+
+class Segments:
+    """
+    Audience segments materialized as Redis sets, targeted by the newsletters.
+
+    The sets are updated incrementally by the bot middlewares, the chat member handlers and
+    the admin panel, and rebuilt from the database by the `rebuild_segments` job.
+    Segments are combined with set operations in Redis, so an audience is read in O(its size)
+    without querying the database.
+    """
+
+    def __init__(self, redis: Redis) -> None:
+        """
+        Initialize the Segments.
+
+        :param redis: The Redis client.
+        """
+        self.redis = redis
+
+    async def touch_user(self, user_db: UserDB) -> None:
+        """
+        Record an update from the user: the user is active and can receive messages.
+
+        :param user_db: The user from the database.
+        """
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.zadd(ACTIVE_KEY, {user_db.id: int(time.time())})
+            self._set_user(pipe, user_db.id, user_db.state, user_db.broadcast)
+            await pipe.execute()
+
+    async def set_user(self, user_id: int, state: str, broadcast: bool) -> None:
+        """
+        Update the segments of the user after a change of its state or subscription.
+
+        :param user_id: The ID of the user.
+        :param state: The chat member state of the bot in the private chat.
+        :param broadcast: Whether the user subscribed to the notifications.
+        """
+        async with self.redis.pipeline(transaction=False) as pipe:
+            self._set_user(pipe, user_id, state, broadcast)
+            await pipe.execute()
+
+    @staticmethod
+    def _set_user(pipe: Pipeline, user_id: int, state: str, broadcast: bool) -> None:
+        if state == ChatMemberStatus.MEMBER and broadcast:
+            pipe.sadd(USERS_KEY, user_id)
+            pipe.sadd(SUBSCRIBED_KEY, user_id)
+        elif state == ChatMemberStatus.MEMBER:
+            pipe.sadd(USERS_KEY, user_id)
+            pipe.srem(SUBSCRIBED_KEY, user_id)
+        else:
+            pipe.srem(USERS_KEY, user_id)
+            pipe.srem(SUBSCRIBED_KEY, user_id)
+
+    async def set_chat(self, chat_id: int, chat_type: str, broadcast: bool, members: Union[int, None] = None) -> None:
+        """
+        Update the segments of a group or a channel.
+
+        :param chat_id: The ID of the chat.
+        :param chat_type: The type of the chat.
+        :param broadcast: Whether the broadcast is enabled for the chat.
+        :param members: The number of members of the chat, if known.
+        """
+        key = CHANNELS_KEY if chat_type == ChatType.CHANNEL else GROUPS_KEY
+        async with self.redis.pipeline(transaction=False) as pipe:
+            if broadcast:
+                pipe.sadd(key, chat_id)
+            else:
+                pipe.srem(key, chat_id)
+            if members is not None:
+                pipe.zadd(CHAT_MEMBERS_KEY, {chat_id: members})
+            await pipe.execute()
+
+    async def remove(self, ids: List[int]) -> None:
+        """
+        Remove dead chats (blocked, kicked, not found) from all the segments.
+
+        :param ids: The IDs of the users and chats.
+        """
+        if not ids:
+            return
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key in (USERS_KEY, SUBSCRIBED_KEY, GROUPS_KEY, CHANNELS_KEY):
+                pipe.srem(key, *ids)
+            await pipe.execute()
+
+    async def set_admins(self, ids: Iterable[int]) -> None:
+        """
+        Replace the admins segment.
+
+        :param ids: The user IDs of the admins.
+        """
+        await self._replace(ADMINS_KEY, list(ids))
+
+    async def set_chat_members(self, members: Dict[int, int]) -> None:
+        """
+        Replace the numbers of members of the chats.
+
+        :param members: The numbers of members by chat ID.
+        """
+        tmp_key = f"{TMP_KEY}{uuid4()}"
+        items = list(members.items())
+        for i in range(0, len(items), BATCH_SIZE):
+            await self.redis.zadd(tmp_key, dict(items[i:i + BATCH_SIZE]))
+        await self._commit(tmp_key, CHAT_MEMBERS_KEY, bool(items))
+
+    async def _replace(self, key: str, ids: List[int]) -> None:
+        tmp_key = f"{TMP_KEY}{uuid4()}"
+        for i in range(0, len(ids), BATCH_SIZE):
+            await self.redis.sadd(tmp_key, *ids[i:i + BATCH_SIZE])
+        await self._commit(tmp_key, key, bool(ids))
+
+    async def _replace_from_db(self, key: str, ids: AsyncIterator[int]) -> None:
+        tmp_key, batch, empty = f"{TMP_KEY}{uuid4()}", [], True
+        async for item_id in ids:
+            batch.append(item_id)
+            if len(batch) == BATCH_SIZE:
+                await self.redis.sadd(tmp_key, *batch)
+                batch, empty = [], False
+        if batch:
+            await self.redis.sadd(tmp_key, *batch)
+            empty = False
+        await self._commit(tmp_key, key, not empty)
+
+    async def _commit(self, tmp_key: str, key: str, filled: bool) -> None:
+        # Swap the new set in atomically, an empty set doesn't exist in Redis
+        if filled:
+            await self.redis.rename(tmp_key, key)
+        else:
+            await self.redis.delete(key)
+
+    async def rebuild(self, sessionmaker: async_sessionmaker) -> None:
+        """
+        Rebuild the segments stored in the database, fixing any drift of the incremental updates,
+        and drop the activity older than ACTIVE_RETENTION_DAYS.
+
+        :param sessionmaker: The SQLAlchemy sessionmaker object.
+        """
+        member = UserDB.state == ChatMemberStatus.MEMBER
+        await self._replace_from_db(USERS_KEY, iter_ids(sessionmaker, UserDB.id, member))
+        await self._replace_from_db(
+            SUBSCRIBED_KEY, iter_ids(sessionmaker, UserDB.id, member, UserDB.broadcast.is_(True))
+        )
+        await self._replace_from_db(GROUPS_KEY, iter_ids(
+            sessionmaker, ChatDB.id, ChatDB.broadcast.is_(True), ChatDB.type != ChatType.CHANNEL,
+        ))
+        await self._replace_from_db(CHANNELS_KEY, iter_ids(
+            sessionmaker, ChatDB.id, ChatDB.broadcast.is_(True), ChatDB.type == ChatType.CHANNEL,
+        ))
+        await self.set_admins(await AdminDB.get_all_ids(sessionmaker))
+        await self.redis.zremrangebyscore(ACTIVE_KEY, "-inf", time.time() - ACTIVE_RETENTION_DAYS * 86400)
+
+    async def get_chat_ids(self) -> List[int]:
+        """
+        Get the IDs of the groups and channels with broadcast enabled.
+        """
+        return [int(chat_id) for chat_id in await self.redis.sunion([GROUPS_KEY, CHANNELS_KEY])]
+
+    async def _evaluate_segment(self, name: str, tmp_key: str) -> str:
+        """
+        Get the key of a segment, storing the computed ones in the temporary key.
+        """
+        if name in BASE_SEGMENTS:
+            return BASE_SEGMENTS[name]
+        if name == "chats":
+            await self.redis.zunionstore(tmp_key, [GROUPS_KEY, CHANNELS_KEY])
+        elif match := ACTIVE_SEGMENT.match(name):
+            since = time.time() - int(match.group(1)) * 86400
+            await self.redis.zrangestore(tmp_key, ACTIVE_KEY, since, "+inf", byscore=True)
+            await self.redis.zinterstore(tmp_key, [tmp_key, USERS_KEY])
+        elif match := MEMBERS_SEGMENT.match(name):
+            chats_key = f"{tmp_key}:chats"
+            await self.redis.zunionstore(chats_key, [GROUPS_KEY, CHANNELS_KEY])
+            await self.redis.zrangestore(tmp_key, CHAT_MEMBERS_KEY, int(match.group(1)), "+inf", byscore=True)
+            await self.redis.zinterstore(tmp_key, [tmp_key, chats_key])
+            await self.redis.delete(chats_key)
+        await self.redis.expire(tmp_key, TMP_TTL)
+        return tmp_key
+
+    async def iter_ids(self, expression: str, batch_size: int = BATCH_SIZE) -> AsyncIterator[int]:
+        """
+        Iterate over the IDs of a segment expression (see `parse_segment`), in batches.
+
+        The segment is evaluated once into a temporary sorted set, then read by rank,
+        so each ID is yielded exactly once even if the segments change meanwhile.
+
+        :param expression: The segment expression.
+        :param batch_size: The number of IDs read per Redis command.
+        :raises SegmentError: If the expression is invalid.
+        """
+        parsed = parse_segment(expression)
+        prefix = f"{TMP_KEY}{uuid4()}"
+        result_key, keys = f"{prefix}:result", [f"{prefix}:{i}" for i in range(len(parsed))]
+        try:
+            for i, (operator, name) in enumerate(parsed):
+                key = await self._evaluate_segment(name, keys[i])
+                if i == 0:
+                    await self.redis.zunionstore(result_key, [key])
+                elif OPERATORS[operator] == "union":
+                    await self.redis.zunionstore(result_key, [result_key, key])
+                elif OPERATORS[operator] == "inter":
+                    await self.redis.zinterstore(result_key, [result_key, key])
+                else:
+                    await self.redis.zdiffstore(result_key, [result_key, key])
+            await self.redis.expire(result_key, TMP_TTL)
+
+            start = 0
+            while True:
+                batch = await self.redis.zrange(result_key, start, start + batch_size - 1)
+                for chat_id in batch:
+                    yield int(chat_id)
+                if len(batch) < batch_size:
+                    return
+                start += batch_size
+        finally:
+            await self.redis.delete(result_key, *keys)
@@ -0,0 +1,5 @@
+from .loop import LoopMonitor
+
+__all__ = [
+    "LoopMonitor",
+]
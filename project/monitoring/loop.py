@@ -0,0 +1,114 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from typing import Union
+
+from .metrics import EVENT_LOOP_BLOCKED, EVENT_LOOP_BLOCKS, EVENT_LOOP_LAG
+
+
+class LoopMonitor:
+    """
+    Monitor of the event loop responsiveness.
+
+    A ticker task records the lag of the loop wakeups. A watchdog thread detects when the loop
+    is blocked by a slow callback (the ticker doesn't tick), samples the stack of the loop thread
+    while it stays blocked and logs the most frequent stack once the loop is released.
+    """
+
+    def __init__(
+            self,
+            interval: float = 0.05,
+            slow_callback_duration: float = 0.1,
+            sample_interval: float = 0.01,
+    ) -> None:
+        """
+        Initialize the LoopMonitor.
+
+        :param interval: Interval in seconds between the ticks.
+        :param slow_callback_duration: Duration in seconds after which a callback is slow.
+        :param sample_interval: Interval in seconds between the stack samples of a blocked loop.
+        """
+        self.interval = interval
+        self.slow_callback_duration = slow_callback_duration
+        self.sample_interval = sample_interval
+
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: Union[int, None] = None
+        self._ticker: Union[asyncio.Task, None] = None
+        self._watchdog: Union[threading.Thread, None] = None
+        self._stopped = threading.Event()
+
+    async def _tick(self) -> None:
+        """
+        Sleep for the interval and record how late the loop woke up.
+        """
+        while True:
+            started = time.monotonic()
+            self._heartbeat = started
+            await asyncio.sleep(self.interval)
+            self._heartbeat = time.monotonic()
+            EVENT_LOOP_LAG.observe(max(0.0, self._heartbeat - started - self.interval))
+
+    def _sample_stack(self) -> Union[str, None]:
+        """
+        Format the current stack of the loop thread.
+
+        :return: The formatted stack or None if the thread is not running.
+        """
+        frame = sys._current_frames().get(self._loop_thread_id)  # noqa
+        if frame is None:
+            return None
+        return "".join(traceback.format_stack(frame))
+
+    def _watch(self) -> None:
+        """
+        Watchdog thread detecting blocks of the event loop.
+        """
+        # The heartbeat is late by the interval while the ticker sleeps
+        threshold = self.interval + self.slow_callback_duration
+        while not self._stopped.wait(self.sample_interval):
+            heartbeat = self._heartbeat
+            if time.monotonic() - heartbeat < threshold:
+                continue
+
+            samples = Counter()
+            while self._heartbeat == heartbeat and not self._stopped.wait(self.sample_interval):
+                stack = self._sample_stack()
+                if stack:
+                    samples[stack] += 1
+
+            blocked = time.monotonic() - heartbeat - self.interval
+            EVENT_LOOP_BLOCKS.inc()
+            EVENT_LOOP_BLOCKED.inc(blocked)
+            if samples:
+                stack, count = samples.most_common(1)[0]
+                logging.warning(
+                    f"Event loop blocked for {blocked:.3f}s, "
+                    f"most frequent stack ({count}/{sum(samples.values())} samples):\n{stack}"
+                )
+
+    def start(self) -> None:
+        """
+        Start the ticker task on the running loop and the watchdog thread.
+        """
+        self._loop_thread_id = threading.get_ident()
+        self._stopped.clear()
+        self._ticker = asyncio.create_task(self._tick())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-monitor", daemon=True)
+        self._watchdog.start()
+
+    def stop(self) -> None:
+        """
+        Stop the ticker task and the watchdog thread.
+        """
+        self._stopped.set()
+        if self._ticker is not None:
+            self._ticker.cancel()
+            self._ticker = None
+        if self._watchdog is not None:
+            self._watchdog.join()
+            self._watchdog = None
@@ -0,0 +1,95 @@
+from prometheus_client import Counter, Histogram
+
+# Buckets in seconds for short delays, from 1 ms up to 10 s
+DELAY_BUCKETS = (.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10)
+# Buckets in seconds for long running tasks, from 100 ms up to 1 hour
+TASK_BUCKETS = (.1, .25, .5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Delay between the expected and the actual wakeup of the loop monitor.",
+    buckets=DELAY_BUCKETS,
+)
+EVENT_LOOP_BLOCKS = Counter(
+    "event_loop_blocks_total",
+    "Number of times the event loop was blocked longer than the slow callback threshold.",
+)
+EVENT_LOOP_BLOCKED = Counter(
+    "event_loop_blocked_seconds_total",
+    "Total time the event loop was blocked longer than the slow callback threshold.",
+)
+SCHEDULER_JOB_DURATION = Histogram(
+    "scheduler_job_duration_seconds",
+    "Duration of the scheduler jobs.",
+    ["job", "status"],
+    buckets=TASK_BUCKETS,
+)
+SCHEDULER_JOB_OVERRUNS = Counter(
+    "scheduler_job_overruns_total",
+    "Number of job runs that took longer than the interval of their trigger.",
+    ["job"],
+)
+
+API_REQUEST_DURATION = Histogram(
+    "api_request_duration_seconds",
+    "Duration of the requests to the external APIs (GitHub, TON API, TON Society).",
+    ["api", "status"],
+    buckets=DELAY_BUCKETS,
+)
+GITHUB_ISSUES_PARSED = Counter(
+    "github_issues_parsed_total",
+    "Number of GitHub issues parsed.",
+)
+SYNC_STAGE_DURATION = Histogram(
+    "sync_stage_duration_seconds",
+    "Duration of the stages of the GitHub issues sync (fetch, categorize, upsert, notify).",
+    ["stage"],
+    buckets=TASK_BUCKETS,
+)
+SYNC_TRANSITIONS = Counter(
+    "sync_transitions_total",
+    "Number of issues detected per transition (created, closing, approved, completed).",
+    ["transition"],
+)
+DB_UPSERT_ROWS = Counter(
+    "db_upsert_rows_total",
+    "Number of rows created or updated by the bulk updates.",
+    ["table"],
+)
+TELEGRAM_SENDS = Counter(
+    "telegram_sends_total",
+    "Number of messages sent per source (send_message, newsletter) and outcome "
+    "(sent, retried, blocked, not_found, failed).",
+    ["source", "outcome"],
+)
+TELEGRAM_FLOOD_WAIT = Counter(
+    "telegram_flood_wait_seconds_total",
+    "Total time the senders of the process were paused by the flood waits requested by Telegram.",
+)
+CHATS_PRUNED = Counter(
+    "chats_pruned_total",
+    "Number of dead chats removed from the broadcast audiences per source and outcome (blocked, not_found).",
+    ["source", "outcome"],
+)
+TELEGRAM_REQUEST_DURATION = Histogram(
+    "telegram_request_duration_seconds",
+    "Duration of the Telegram Bot API requests per method and status (ok, HTTP status code, 5xx, network, error).",
+    ["method", "status"],
+    buckets=DELAY_BUCKETS,
+)
+HANDLER_DURATION = Histogram(
+    "handler_duration_seconds",
+    "Duration of the bot handlers per router.",
+    ["router", "event"],
+    buckets=DELAY_BUCKETS,
+)
+THROTTLED_UPDATES = Counter(
+    "throttled_updates_total",
+    "Number of updates dropped by the throttling middleware.",
+    ["key"],
+)
+WEBHOOK_UPDATES = Counter(
+    "webhook_updates_total",
+    "Number of webhook updates per status (received, rejected, processed, failed).",
+    ["status"],
+)
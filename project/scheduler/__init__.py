@@ -1,5 +1,9 @@
+from .queues import RedisQueue, BROADCAST_QUEUE_KEY, ISSUE_EVENTS_QUEUE_KEY
 from .scheduler import Scheduler
 
 __all__ = [
+    "RedisQueue",
     "Scheduler",
+    "BROADCAST_QUEUE_KEY",
+    "ISSUE_EVENTS_QUEUE_KEY",
 ]
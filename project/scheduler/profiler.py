@@ -0,0 +1,227 @@
+import base64
+import cProfile
+import io
+import json
+import logging
+import marshal
+import pstats
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Dict, List, Union
+
+from apscheduler.executors.asyncio import AsyncIOExecutor
+from apscheduler.executors.base import run_coroutine_job
+from apscheduler.job import Job
+from apscheduler.util import iscoroutinefunction_partial
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from .timings import get_job_name
+from ..monitoring.metrics import SCHEDULER_JOB_OVERRUNS
+
+# Redis key of the set with the IDs of the jobs to profile
+PROFILING_KEY = "scheduler:profiling"
+# Redis key prefix of the lists with the last profiles of each job
+PROFILES_KEY = "scheduler:profiles:"
+# Number of profiles kept per job
+PROFILES_KEEP = 10
+# Number of functions in the text summary of a profile
+STATS_LINES = 40
+
+
+class JobProfiler:
+    """
+    Profiler of the scheduler jobs.
+
+    Every run is timed and flagged if it takes longer than the trigger interval. The runs of the
+    jobs enabled from the admin panel are profiled with cProfile, the last profiles are kept in Redis
+    (shared by the app and the worker processes).
+
+    The jobs are coroutines, so a profile also contains the callbacks of the other tasks that ran on
+    the event loop during the job. Only one job is profiled at a time.
+    """
+
+    def __init__(self, redis: Redis, keep: int = PROFILES_KEEP) -> None:
+        """
+        Initialize the JobProfiler.
+
+        :param redis: The Redis client.
+        :param keep: The number of profiles kept per job.
+        """
+        self.redis = redis
+        self.keep = keep
+        self._profiling = False
+
+    async def get_enabled(self) -> List[str]:
+        """
+        Get the IDs of the jobs to profile.
+
+        :return: List of job IDs.
+        """
+        return sorted(job_id.decode() for job_id in await self.redis.smembers(PROFILING_KEY))
+
+    async def is_enabled(self, job_id: str) -> bool:
+        """
+        Check if the job is profiled.
+
+        :param job_id: The ID of the job.
+        """
+        return bool(await self.redis.sismember(PROFILING_KEY, job_id))
+
+    async def set_enabled(self, job_id: str, enabled: bool) -> None:
+        """
+        Enable or disable profiling of the job.
+
+        :param job_id: The ID of the job.
+        :param enabled: Whether to profile the job.
+        """
+        if enabled:
+            await self.redis.sadd(PROFILING_KEY, job_id)
+        else:
+            await self.redis.srem(PROFILING_KEY, job_id)
+
+    async def get_profiles(self, job_id: str) -> List[Dict[str, Any]]:
+        """
+        Get the last profiles of the job, newest first.
+
+        :param job_id: The ID of the job.
+        :return: List of profiles (timings, text summary and the marshaled pstats data).
+        """
+        return [json.loads(profile) for profile in await self.redis.lrange(PROFILES_KEY + job_id, 0, -1)]
+
+    async def get_profile_data(self, job_id: str, index: int) -> Union[bytes, None]:
+        """
+        Get the profile data of a run in the pstats format (readable by `pstats.Stats`).
+
+        :param job_id: The ID of the job.
+        :param index: The index of the profile, 0 is the newest.
+        :return: The profile data or None if the profile doesn't exist.
+        """
+        profile = await self.redis.lindex(PROFILES_KEY + job_id, index)
+        return base64.b64decode(json.loads(profile)["data"]) if profile else None
+
+    async def _save(self, job_id: str, profile: Dict[str, Any]) -> None:
+        """
+        Save the profile of a run and drop the oldest ones.
+
+        :param job_id: The ID of the job.
+        :param profile: The profile.
+        """
+        key = PROFILES_KEY + job_id
+        async with self.redis.pipeline(transaction=True) as pipe:
+            await pipe.lpush(key, json.dumps(profile)).ltrim(key, 0, self.keep - 1).execute()
+
+    @staticmethod
+    def get_interval(job: Job, run_time: datetime) -> Union[float, None]:
+        """
+        Get the interval in seconds between the run and the next one.
+
+        :param job: The job.
+        :param run_time: The scheduled time of the run.
+        :return: The interval or None if the job runs once.
+        """
+        next_run_time = job.trigger.get_next_fire_time(run_time, run_time + timedelta(microseconds=1))
+        return (next_run_time - run_time).total_seconds() if next_run_time else None
+
+    async def run(self, job: Job, run_times: List[datetime], coro: Awaitable) -> Any:
+        """
+        Await the job coroutine, timing and optionally profiling it.
+
+        :param job: The job.
+        :param run_times: The scheduled times of the run.
+        :param coro: The coroutine running the job.
+        :return: The result of the coroutine.
+        """
+        try:
+            enabled = not self._profiling and await self.is_enabled(job.id)
+        except RedisError as e:
+            logging.error(f"Failed to check profiling of job {job.id}: {e}")
+            enabled = False
+
+        profile = None
+        if enabled:
+            self._profiling = True
+            profile = cProfile.Profile()
+            profile.enable()
+        started_at = datetime.now(timezone.utc)
+        started, cpu_started = time.perf_counter(), time.thread_time()
+        try:
+            return await coro
+        finally:
+            if profile is not None:
+                profile.disable()
+                self._profiling = False
+            duration, cpu = time.perf_counter() - started, time.thread_time() - cpu_started
+
+            interval = self.get_interval(job, run_times[-1])
+            overrun = interval is not None and duration > interval
+            if overrun:
+                SCHEDULER_JOB_OVERRUNS.labels(get_job_name(job.id)).inc()
+                logging.warning(f"Job {job.id} took {duration:.1f}s, longer than its interval of {interval:.0f}s.")
+
+            if profile is not None:
+                await self._save_profile(job, started_at, duration, cpu, interval, overrun, profile)
+
+    async def _save_profile(
+            self,
+            job: Job,
+            started_at: datetime,
+            duration: float,
+            cpu: float,
+            interval: Union[float, None],
+            overrun: bool,
+            profile: cProfile.Profile,
+    ) -> None:
+        """
+        Summarize the profile of a run and save it.
+        """
+        stream = io.StringIO()
+        stats = pstats.Stats(profile, stream=stream)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(STATS_LINES)
+        profile.create_stats()
+        try:
+            await self._save(job.id, {
+                "started_at": started_at.isoformat(timespec="seconds"),
+                "duration": round(duration, 3),
+                "cpu": round(cpu, 3),
+                "interval": interval,
+                "overrun": overrun,
+                "stats": stream.getvalue(),
+                "data": base64.b64encode(marshal.dumps(profile.stats)).decode(),  # noqa
+            })
+        except RedisError as e:
+            logging.error(f"Failed to save the profile of job {job.id}: {e}")
+
+
+class ProfilingExecutor(AsyncIOExecutor):
+    """
+    AsyncIOExecutor running the coroutine jobs through the JobProfiler.
+    """
+
+    def __init__(self, profiler: JobProfiler) -> None:
+        """
+        Initialize the ProfilingExecutor.
+
+        :param profiler: The JobProfiler object.
+        """
+        super().__init__()
+        self.profiler = profiler
+
+    def _do_submit_job(self, job: Job, run_times: List[datetime]) -> None:
+        if not iscoroutinefunction_partial(job.func):
+            return super()._do_submit_job(job, run_times)
+
+        def callback(f):
+            self._pending_futures.discard(f)
+            try:
+                events = f.result()
+            except BaseException:  # noqa
+                self._run_job_error(job.id, *sys.exc_info()[1:])
+            else:
+                self._run_job_success(job.id, events)
+
+        coro = run_coroutine_job(job, job._jobstore_alias, run_times, self._logger.name)  # noqa
+        f = self._eventloop.create_task(self.profiler.run(job, run_times, coro))
+        f.add_done_callback(callback)
+        self._pending_futures.add(f)
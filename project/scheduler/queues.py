@@ -0,0 +1,88 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Union
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+# Redis key of the list with the IDs of newsletters waiting to be broadcast
+BROADCAST_QUEUE_KEY = "newsletters:queue"
+# Redis key of the list with the numbers of GitHub issues changed according to the webhook
+ISSUE_EVENTS_QUEUE_KEY = "github:issues"
+# Timeout in seconds of a blocking pop, the drainers check for cancellation between pops
+POP_TIMEOUT = 5
+
+
+class RedisQueue:
+    """
+    A Redis list of IDs (newsletters to broadcast, changed GitHub issues) to process.
+
+    The web process only enqueues the IDs, they are processed by the drainers of the process
+    running the scheduler. Each ID is popped by exactly one drainer.
+    """
+
+    def __init__(self, redis: Redis, key: str) -> None:
+        """
+        Initialize the RedisQueue.
+
+        :param redis: The Redis client.
+        :param key: The Redis key of the list.
+        """
+        self.redis = redis
+        self.key = key
+        self._drainers: List[asyncio.Task] = []
+
+    async def put(self, item_id: int) -> None:
+        """
+        Enqueue an ID to process.
+
+        :param item_id: The ID (of the newsletter, of the issue).
+        """
+        await self.redis.lpush(self.key, item_id)
+
+    async def _pop(self) -> Union[int, None]:
+        """
+        Pop the next ID, waiting for it up to POP_TIMEOUT seconds.
+
+        :return: The ID or None if the queue is empty.
+        """
+        item = await self.redis.brpop([self.key], timeout=POP_TIMEOUT)
+        return int(item[1]) if item else None
+
+    async def _drain(self, handler: Callable[[int], Awaitable[None]]) -> None:
+        """
+        Pop IDs and process them one by one.
+
+        :param handler: The coroutine function processing the ID.
+        """
+        while True:
+            try:
+                item_id = await self._pop()
+            except RedisError as e:
+                logging.error(f"Failed to pop from {self.key}: {e}")
+                await asyncio.sleep(POP_TIMEOUT)
+                continue
+            if item_id is None:
+                continue
+            try:
+                await handler(item_id)
+            except Exception as e:
+                logging.exception(f"Failed to process {item_id} from {self.key}: {e}")
+
+    def start(self, handler: Callable[[int], Awaitable[None]], drainers: int = 1) -> None:
+        """
+        Start the drainers.
+
+        :param handler: The coroutine function processing the ID.
+        :param drainers: The number of IDs processed concurrently.
+        """
+        self._drainers = [asyncio.create_task(self._drain(handler)) for _ in range(drainers)]
+
+    async def stop(self) -> None:
+        """
+        Cancel the drainers. A processing in progress is interrupted.
+        """
+        for task in self._drainers:
+            task.cancel()
+        await asyncio.gather(*self._drainers, return_exceptions=True)
+        self._drainers = []
@@ -1,17 +1,47 @@
+import asyncio
+import logging
+from datetime import datetime
 from typing import Union
+
 from apscheduler.job import Job
 from apscheduler.jobstores.redis import RedisJobStore
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.events import EVENT_JOB_ERROR
+from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_SUBMITTED, EVENT_JOB_EXECUTED, JobExecutionEvent
+from redis.asyncio import Redis
+from redis.exceptions import RedisError, LockError
 
 from . import tasks
 from .errors import on_job_error
+from .profiler import JobProfiler, ProfilingExecutor
+from .timings import on_job_event
 from ..config import Config
 
+# Redis key of the scheduler leader lock
+LEADER_LOCK_NAME = "scheduler:leader"
+# Time-to-live in seconds of the leader lock, the lock is lost if not renewed in time
+LEADER_LOCK_TTL = 30
+# Interval in seconds between renewals of the lock (or attempts to acquire it)
+LEADER_RENEW_INTERVAL = 10
+
+# Execution policies of the periodic jobs: runs never overlap, missed runs are collapsed into one
+# and a run late by more than the grace time in seconds is skipped
+JOB_POLICIES = {
+    tasks.track_and_notify.__name__: {"max_instances": 1, "coalesce": True, "misfire_grace_time": 60},
+    tasks.update_society_top.__name__: {"max_instances": 1, "coalesce": True, "misfire_grace_time": 15 * 60},
+    tasks.weekly_update_digest.__name__: {"max_instances": 1, "coalesce": True, "misfire_grace_time": 60 * 60},
+    tasks.rebuild_segments.__name__: {"max_instances": 1, "coalesce": True, "misfire_grace_time": 60 * 60},
+}
+# Execution policy of the other jobs (newsletters)
+JOB_DEFAULTS = {"max_instances": 1, "coalesce": True, "misfire_grace_time": 60 * 60}
+
 
 class Scheduler:
     """
     A class representing a scheduler for managing and running jobs using AsyncIOScheduler.
+
+    Every process shares the Redis job store, but only the elected leader runs the jobs.
+    The leadership is a Redis lock renewed by the leader; if the leader dies, another process
+    acquires the lock once it expires.
     """
 
     def __init__(self, config: Config) -> None:
@@ -25,9 +55,24 @@ class Scheduler:
             port=config.redis.PORT,
             db=config.redis.DB + 1,
         )
+        self.redis = Redis.from_url(config.redis.dsn())
+        self.profiler = JobProfiler(self.redis)
         self.scheduler = AsyncIOScheduler(
             jobstores={'default': self.job_store},
+            executors={'default': ProfilingExecutor(self.profiler)},
+            job_defaults=JOB_DEFAULTS,
         )
+        # Bounds of the adaptive interval of the GitHub issues sync, it starts at the minimum.
+        # With the GitHub webhook enabled, the sync only reconciles missed events at a fixed interval
+        if config.github.WEBHOOK_SECRET:
+            self.sync_min_interval = self.sync_max_interval = config.scheduler.SYNC_RECONCILE_INTERVAL
+        else:
+            self.sync_min_interval = config.scheduler.SYNC_MIN_INTERVAL
+            self.sync_max_interval = config.scheduler.SYNC_MAX_INTERVAL
+        self.sync_interval = self.sync_min_interval
+        self.leader_lock = self.redis.lock(LEADER_LOCK_NAME, timeout=LEADER_LOCK_TTL)
+        self.leader_task: Union[asyncio.Task, None] = None
+        self.is_leader = False
 
     def get_all_job_ids(self) -> list[str]:
         """
@@ -50,7 +95,7 @@ class Scheduler:
 
     def _add_track_and_notify_issue(self) -> Job:
         """
-        Add a job for tracking and notifying issues at a 1-minute interval.
+        Add a job for tracking and notifying issues at the adaptive sync interval.
 
         :return: The added Job object.
         """
@@ -59,10 +104,28 @@ class Scheduler:
         return self.scheduler.add_job(
             func=tasks.track_and_notify,
             trigger="interval",
-            minutes=1,
+            seconds=self.sync_interval,
             id=job_id,
+            **JOB_POLICIES[job_id],
         )
 
+    def _on_track_and_notify_executed(self, event: JobExecutionEvent) -> None:
+        """
+        Adapt the interval of the GitHub issues sync: poll at the minimum interval
+        while issues change, double the interval (up to the maximum) when nothing changed.
+
+        :param event: The job execution event, its return value is the number of changed issues.
+        """
+        if event.job_id != tasks.track_and_notify.__name__:
+            return
+        if event.retval:
+            interval = self.sync_min_interval
+        else:
+            interval = min(self.sync_interval * 2, self.sync_max_interval)
+        if interval != self.sync_interval:
+            self.sync_interval = interval
+            self.scheduler.reschedule_job(event.job_id, trigger="interval", seconds=interval)
+
     def _add_weekly_update_digest(self) -> Job:
         """
         Add a job for weekly update of digest on Mondays at 10:00 AM.
@@ -78,11 +141,29 @@ class Scheduler:
             hour=10,
             minute=0,
             id=job_id,
+            **JOB_POLICIES[job_id],
+        )
+
+    def _add_rebuild_segments(self) -> Job:
+        """
+        Add a job for rebuilding the audience segments at 1 day intervals, starting immediately.
+
+        :return: The added Job object.
+        """
+        job_id = tasks.rebuild_segments.__name__
+        self._delete_job(job_id)
+        return self.scheduler.add_job(
+            func=tasks.rebuild_segments,
+            trigger="interval",
+            days=1,
+            id=job_id,
+            next_run_time=datetime.now(),
+            **JOB_POLICIES[job_id],
         )
 
     def _add_update_society_top(self) -> Job:
         """
-        Add a job for updating the society's contributors at 12 hour intervals.
+        Add a job for updating the society's contributors at 1 hour intervals, starting immediately.
 
         :return: The added Job object.
         """
@@ -91,23 +172,80 @@ class Scheduler:
         return self.scheduler.add_job(
             func=tasks.update_society_top,
             trigger="interval",
-            hours=12,
+            hours=1,
             id=job_id,
+            next_run_time=datetime.now(),
+            **JOB_POLICIES[job_id],
         )
 
-    def run(self) -> None:
+    def _on_elected(self) -> None:
         """
-        Start the scheduler and add jobs.
+        Add jobs and resume the scheduler when this process becomes the leader.
         """
-        self.scheduler.start()
-        self.scheduler.add_listener(on_job_error, mask=EVENT_JOB_ERROR)
+        logging.info("Scheduler leadership acquired.")
+        self.is_leader = True
+        self.sync_interval = self.sync_min_interval
         self._add_update_society_top()
         self._add_track_and_notify_issue()
+        self._add_rebuild_segments()
+        self.scheduler.resume()
+
+    def _on_deposed(self) -> None:
+        """
+        Pause the scheduler when this process loses the leadership.
+        """
+        logging.warning("Scheduler leadership lost.")
+        self.is_leader = False
+        self.scheduler.pause()
 
-    def shutdown(self) -> None:
+    async def _elect(self) -> None:
         """
-        Shutdown the scheduler and delete both jobs.
+        Acquire the leader lock, or renew it while this process is the leader.
         """
-        self._delete_job(tasks.update_society_top.__name__)
-        self._delete_job(tasks.track_and_notify.__name__)
+        while True:
+            try:
+                if self.is_leader:
+                    await self.leader_lock.reacquire()
+                elif await self.leader_lock.acquire(blocking=False):
+                    self._on_elected()
+            except (LockError, RedisError) as e:
+                logging.exception(f"Scheduler leader election failed: {e}")
+                if self.is_leader:
+                    self._on_deposed()
+            await asyncio.sleep(LEADER_RENEW_INTERVAL)
+
+    def run(self, elect: bool = True) -> None:
+        """
+        Start the scheduler paused and run the leader election.
+
+        Paused schedulers still write jobs (e.g. newsletters) to the shared job store,
+        the jobs are executed by the leader.
+
+        :param elect: Whether this process may become the leader. Web processes don't
+            when the jobs are run by the dedicated worker process.
+        """
+        self.scheduler.start(paused=True)
+        self.scheduler.add_listener(on_job_error, mask=EVENT_JOB_ERROR)
+        self.scheduler.add_listener(on_job_event, mask=EVENT_JOB_SUBMITTED | EVENT_JOB_EXECUTED | EVENT_JOB_ERROR)
+        self.scheduler.add_listener(self._on_track_and_notify_executed, mask=EVENT_JOB_EXECUTED)
+        if elect:
+            self.leader_task = asyncio.create_task(self._elect())
+
+    async def shutdown(self) -> None:
+        """
+        Stop the leader election, delete the periodic jobs and release the leadership if this process
+        is the leader, then shutdown the scheduler.
+        """
+        if self.leader_task is not None:
+            self.leader_task.cancel()
+        if self.is_leader:
+            self._delete_job(tasks.update_society_top.__name__)
+            self._delete_job(tasks.track_and_notify.__name__)
+            self._delete_job(tasks.rebuild_segments.__name__)
+            try:
+                await self.leader_lock.release()
+            except (LockError, RedisError):
+                pass
+            self.is_leader = False
         self.scheduler.shutdown()
+        await self.redis.aclose()
@@ -1,8 +1,10 @@
+from .rebuild_segments import rebuild_segments
 from .track_and_notify import track_and_notify
 from .update_society_top import update_society_top
 from .weekly_update_digest import weekly_update_digest
 
 __all__ = [
+    "rebuild_segments",
     "track_and_notify",
     "update_society_top",
     "weekly_update_digest",
@@ -0,0 +1,34 @@
+import asyncio
+import logging
+from typing import Dict
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramAPIError
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from ...db.segments import Segments
+
+
+async def rebuild_segments() -> None:
+    """
+    Rebuild the audience segments from the database and refresh the numbers of members
+    of the groups and channels.
+    """
+    loop = asyncio.get_event_loop()
+    bot: Bot = loop.__getattribute__("bot")
+    redis: Redis = loop.__getattribute__("redis")
+    sessionmaker: async_sessionmaker = loop.__getattribute__("sessionmaker")
+
+    segments = Segments(redis)
+    await segments.rebuild(sessionmaker)
+
+    # Refresh the numbers of members of the chats, one request per chat
+    members: Dict[int, int] = {}
+    for chat_id in await segments.get_chat_ids():
+        try:
+            members[chat_id] = await bot.get_chat_member_count(chat_id)
+        except TelegramAPIError as e:
+            logging.warning(f"Failed to get the number of members of chat {chat_id}: {e}")
+        await asyncio.sleep(0.05)
+    await segments.set_chat_members(members)
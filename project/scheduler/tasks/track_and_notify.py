@@ -1,56 +1,191 @@
 import asyncio
-from typing import List, Tuple, Any
+import logging
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator, List, Tuple, Any
 
 from aiogram import Bot
 from aiogram.types import InlineKeyboardMarkup as Markup
 from aiogram.types import InlineKeyboardButton as Button
+from redis.asyncio import Redis
+from redis.exceptions import LockError, RedisError
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from ...apis.github import GitHubAPI
 from ...apis.github.models import Issue
+from ...bot.utils.audience import AudiencePruner, BroadcastAborted
 from ...bot.utils.formatters import format_issue_notify_to_message
 from ...bot.utils.messages import send_message
 from ...bot.utils.texts.buttons import TextButton, ButtonCode
 from ...bot.utils.texts.messages import TextMessage, MessageCode
-from ...config import BOUNTIES_CREATOR_BOT_URL
+from ...config import BOUNTIES_CREATOR_BOT_URL, Config
 from ...db.models import IssueDB, ChatDB
+from ...db.segments import Segments
+from ...monitoring.metrics import SYNC_STAGE_DURATION, SYNC_TRANSITIONS, DB_UPSERT_ROWS
 
+# Redis lock serializing the changes of the issues by the sync and by the webhook events,
+# so that a change is applied (and notified) only once
+SYNC_LOCK_NAME = "issues:sync"
+# Time-to-live in seconds of the lock, renewed while the changes are applied
+SYNC_LOCK_TTL = 300
+# Interval in seconds between renewals of the lock
+SYNC_LOCK_RENEW_INTERVAL = 60
 
-async def track_and_notify() -> None:
+
+async def track_and_notify() -> int:
     """
     Track and notify about GitHub issues.
+
+    With the GitHub webhook enabled, the changes are pushed by `process_issue_event`
+    and this job only reconciles the missed events at a slow interval.
+
+    :return: The number of issues created or updated on GitHub since the last run,
+        used by the scheduler to adapt the polling interval.
     """
     loop = asyncio.get_event_loop()
     bot: Bot = loop.__getattribute__("bot")
+    config: Config = loop.__getattribute__("config")
+    redis: Redis = loop.__getattribute__("redis")
     githubapi: GitHubAPI = loop.__getattribute__("githubapi")
     sessionmaker: async_sessionmaker = loop.__getattribute__("sessionmaker")
 
-    # Fetch issues from the database and GitHub
-    issues_db: List[IssueDB] = await IssueDB.get_all(sessionmaker)
-    issues_github: List[Issue] = await githubapi.get_issues_all("all")
+    # Fetch issues from GitHub
+    with SYNC_STAGE_DURATION.labels("fetch").time():
+        issues_github: List[Issue] = await githubapi.get_issues_all("all")
 
     if not any(issues_github):
-        return None
+        return 0
+
+    # Fetch issues from the database and apply the changes, while no webhook event is applied
+    async with _sync_lock(redis):
+        issues_db: List[IssueDB] = await IssueDB.get_all(sessionmaker)
+        changed = _count_changed(issues_db, issues_github)
+        changes = await _apply(sessionmaker, issues_db, issues_github)
+
+    await _notify(bot, sessionmaker, Segments(redis), config.bot.PREVIEW_PHOTOS, *changes)
+    return changed
+
+
+async def process_issue_event(issue_number: int) -> None:
+    """
+    Apply and notify about the change of an issue pushed by the GitHub webhook.
+
+    The issue is fetched from the GitHub API, the webhook payload has no rendered body.
+
+    :param issue_number: The number of the changed issue.
+    """
+    loop = asyncio.get_event_loop()
+    bot: Bot = loop.__getattribute__("bot")
+    config: Config = loop.__getattribute__("config")
+    redis: Redis = loop.__getattribute__("redis")
+    githubapi: GitHubAPI = loop.__getattribute__("githubapi")
+    sessionmaker: async_sessionmaker = loop.__getattribute__("sessionmaker")
+
+    issue_github = await githubapi.get_issue(issue_number)
+
+    async with _sync_lock(redis):
+        issue_db = await IssueDB.get(sessionmaker, issue_number)
+        changes = await _apply(sessionmaker, [issue_db] if issue_db else [], [issue_github])
+
+    await _notify(bot, sessionmaker, Segments(redis), config.bot.PREVIEW_PHOTOS, *changes)
+
+
+@asynccontextmanager
+async def _sync_lock(redis: Redis) -> AsyncIterator[None]:
+    """
+    Hold the sync lock, renewing it until the block exits.
+
+    A failed renewal or release is logged instead of raised: the block has already
+    committed its changes to the database, and they still have to be notified.
+
+    :param redis: The Redis object.
+    """
+    lock = redis.lock(SYNC_LOCK_NAME, timeout=SYNC_LOCK_TTL)
+    await lock.acquire()
+
+    async def renew() -> None:
+        while True:
+            await asyncio.sleep(SYNC_LOCK_RENEW_INTERVAL)
+            try:
+                await lock.reacquire()
+            except (LockError, RedisError) as e:
+                logging.warning(f"Failed to renew the {SYNC_LOCK_NAME} lock: {e}")
+                return
+
+    renewal = asyncio.create_task(renew())
+    try:
+        yield
+    finally:
+        renewal.cancel()
+        with suppress(asyncio.CancelledError):
+            await renewal
+        try:
+            await lock.release()
+        except (LockError, RedisError) as e:
+            logging.warning(f"Failed to release the {SYNC_LOCK_NAME} lock: {e}")
+
+
+async def _apply(
+        sessionmaker: async_sessionmaker,
+        issues_db: List[IssueDB],
+        issues_github: List[Issue],
+) -> Tuple[List[Issue], List[Any], List[Any], List[Any]]:
+    """
+    Categorize the GitHub issues and update the database with them.
 
+    :param sessionmaker: The SQLAlchemy sessionmaker object.
+    :param issues_db: List of issues from the database.
+    :param issues_github: List of issues from the GitHub API.
+    :return: Tuple containing lists of created, closing, approved, and completed issues.
+    """
     # Categorize issues into different lists
-    created_issues, closing_issues, approved_issues, completed_issues = await _categorize(issues_db, issues_github)
+    with SYNC_STAGE_DURATION.labels("categorize").time():
+        changes = await _categorize(issues_db, issues_github)
+    for transition, issues in zip(("created", "closing", "approved", "completed"), changes):
+        SYNC_TRANSITIONS.labels(transition).inc(len(issues))
 
     # Update the database with the latest GitHub issues
-    await IssueDB.update_all(sessionmaker, issues_github)
+    with SYNC_STAGE_DURATION.labels("upsert").time():
+        await IssueDB.update_all(sessionmaker, issues_github)
+    DB_UPSERT_ROWS.labels(IssueDB.__tablename__).inc(len(issues_github))
+
+    return changes
 
+
+async def _notify(
+        bot: Bot,
+        sessionmaker: async_sessionmaker,
+        segments: Segments,
+        preview_photos: bool,
+        created_issues: List[Issue],
+        closing_issues: List[Issue],
+        approved_issues: List[Issue],
+        completed_issues: List[Issue],
+) -> None:
+    """
+    Notify all chats about the created, closing, approved, and completed issues.
+
+    :param bot: The Bot object.
+    :param sessionmaker: The SQLAlchemy sessionmaker object.
+    :param segments: The Segments object, the dead chats are removed from them.
+    :param preview_photos: Whether the previews are sent as photos instead of hidden links.
+
+    The changes are already committed when the chats are notified, so a stopped broadcast is logged
+    with the issues left unnotified instead of being raised.
+    """
     # If no issues to notify, return
     if not any([created_issues, closing_issues, approved_issues, completed_issues]):
         return None
 
-    # Retrieve all chats ids
-    chats_ids: List[int, None] = await ChatDB.get_all_ids(sessionmaker)
+    pruner = AudiencePruner(sessionmaker, "issues", segments=segments)
+    # Numbers of the issues whose notification is not finished
+    unnotified = [issue.number for issue in created_issues + closing_issues + approved_issues + completed_issues]
     create_bounty_button = await TextButton(sessionmaker).get_button(
         ButtonCode.CREATE_BOUNTY, url=BOUNTIES_CREATOR_BOT_URL
     )
 
     async def notify(issue_list: List[Issue], message_code: str, button_code: str) -> None:
         # Notify users about issues
-        message_text = await TextMessage(sessionmaker).get(message_code)
+        message_text, preview = await TextMessage(sessionmaker, preview_photos).get_with_preview(message_code)
         button_text = await TextButton(sessionmaker).get(button_code)
 
         for issue in issue_list:
@@ -58,21 +193,50 @@ async def track_and_notify() -> None:
             button = Button(text=button_text, url=issue.url)
             reply_markup = Markup(inline_keyboard=[[button], [create_bounty_button]])
 
-            for chat_id in chats_ids:
-                await send_message(bot, chat_id, text, reply_markup=reply_markup)
+            # Send to all chats as they are read
+            async for chat_id in ChatDB.iter_all_ids(sessionmaker):
+                # Skip the chats that turned out dead with a previous issue
+                if pruner.is_dead(chat_id):
+                    continue
+                result = await send_message(bot, chat_id, text, reply_markup=reply_markup, preview=preview)
+                await pruner.track(chat_id, result)
+            unnotified.remove(issue.number)
+
+    try:
+        # Notify about different types of issues
+        with SYNC_STAGE_DURATION.labels("notify").time():
+            if created_issues:
+                await notify(created_issues, MessageCode.ISSUE_CREATED, ButtonCode.ISSUE_CREATED)
 
-    # Notify about different types of issues
-    if created_issues:
-        await notify(created_issues, MessageCode.ISSUE_CREATED, ButtonCode.ISSUE_CREATED)
+            if closing_issues:
+                await notify(closing_issues, MessageCode.ISSUE_CLOSING, ButtonCode.ISSUE_CLOSING)
 
-    if closing_issues:
-        await notify(closing_issues, MessageCode.ISSUE_CLOSING, ButtonCode.ISSUE_CLOSING)
+            if approved_issues:
+                await notify(approved_issues, MessageCode.ISSUE_APPROVED, ButtonCode.ISSUE_APPROVED)
 
-    if approved_issues:
-        await notify(approved_issues, MessageCode.ISSUE_APPROVED, ButtonCode.ISSUE_APPROVED)
+            if completed_issues:
+                await notify(completed_issues, MessageCode.ISSUE_COMPLETED, ButtonCode.ISSUE_COMPLETED)
+        await pruner.close()
+    except BroadcastAborted:
+        # The breaker already logged the reason, the changes are not notified again by the next sync
+        logging.error(f"Issues not notified to all chats: {', '.join(f'#{n}' for n in unnotified) or 'none'}")
 
-    if completed_issues:
-        await notify(completed_issues, MessageCode.ISSUE_COMPLETED, ButtonCode.ISSUE_COMPLETED)
+
+def _count_changed(issues_db: List[IssueDB], issues_github: List[Issue]) -> int:
+    """
+    Count the GitHub issues created or updated since they were stored in the database.
+
+    :param issues_db: List of issues from the database.
+    :param issues_github: List of issues from the GitHub API.
+    :return: The number of changed issues.
+    """
+    # The database stores naive UTC datetimes
+    updated_at_db = {issue.number: issue.updated_at for issue in issues_db}
+    return sum(
+        1 for issue in issues_github
+        if issue.number not in updated_at_db
+        or (issue.updated_at and issue.updated_at.replace(tzinfo=None)) != updated_at_db[issue.number]
+    )
 
 
 async def _categorize(
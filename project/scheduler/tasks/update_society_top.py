@@ -1,27 +1,65 @@
+import time
 from collections import OrderedDict
+from typing import Dict, Any
 
 from ...apis.society import TONSocietyAPI
 from ...apis.society.storage import SocietyStorage
 
+# ID of the TON Society collection with bounty SBTs
+BOUNTY_COLLECTION_ID = 44
+# Interval in seconds between full re-crawls of every user's SBTs
+FULL_SWEEP_INTERVAL = 24 * 60 * 60
+
 
 async def update_society_top() -> None:
-    """Updates the society's contributors top data by fetching it from the TON Society API."""
+    """
+    Updates the society's contributors top data by fetching it from the TON Society API.
+
+    Only new users and users whose total awards count changed since the last run are re-crawled,
+    everyone else keeps the awards count stored in the crawl state. A full sweep of all users
+    is performed once per FULL_SWEEP_INTERVAL.
+    """
 
-    # Initialize TON Society API, Society Storage, and TON API with the provided key
+    # Initialize TON Society API and Society Storage
     society_api = TONSocietyAPI()
     society_storage = SocietyStorage()
 
-    # Fetch all users from the TON Society API for the specified collection ID
-    bounty_users = await society_api.get_all_users_by_collection(44)
+    # Load the crawl state of the previous run
+    state = await society_storage.get_state()
+    users_state: Dict[str, Dict[str, Any]] = state.get("users", {})
+    now = int(time.time())
+    full_sweep = now - state.get("full_sweep_at", 0) >= FULL_SWEEP_INTERVAL
+
+    # Fetch all users from the TON Society API for the bounty collection and drop duplicates
+    bounty_users = await society_api.get_all_users_by_collection(BOUNTY_COLLECTION_ID)
+    bounty_users = list(OrderedDict((d.id, d) for d in bounty_users).values())
 
-    # Update each bounty user with raw and friendly addresses
+    # Update each bounty user with the count of bounty awards
+    new_users_state = {}
     for bounty_user in bounty_users:
-        sbts = await society_api.get_all_sbts_by_user(bounty_user.username)
-        bounty_user.awards_count = len([sbt for sbt in sbts if sbt.sbt_collections_id == 44])
+        awards_total = bounty_user.awards_count
+        user_state = users_state.get(bounty_user.id)
+
+        # Re-crawl SBTs only for new or changed users, or on a full sweep
+        if full_sweep or user_state is None or user_state.get("awards_total") != awards_total:
+            sbts = await society_api.get_all_sbts_by_user(bounty_user.username)
+            user_state = {
+                "awards_total": awards_total,
+                "sbt_ids": [sbt.id for sbt in sbts if sbt.sbt_collections_id == BOUNTY_COLLECTION_ID],
+                "checked_at": now,
+            }
+
+        new_users_state[bounty_user.id] = user_state
+        bounty_user.awards_count = len(user_state["sbt_ids"])
 
     # Sort users based on awards_count in descending order
-    bounty_users = list(OrderedDict((d.id, d) for d in bounty_users).values())
     society_top = sorted(bounty_users, key=lambda x: x.awards_count, reverse=True)
     if any(society_top):
-        # Save the updated society top data to storage
+        # Save the updated society top data and the crawl state to storage
         await society_storage.save_users(society_top)
+        await society_storage.save_state(
+            {
+                "full_sweep_at": now if full_sweep else state.get("full_sweep_at", 0),
+                "users": new_users_state,
+            }
+        )
@@ -1,17 +1,20 @@
 import asyncio
-from typing import Tuple, List
+from typing import Tuple
 
 from aiogram import Bot
 from aiogram.types import InlineKeyboardMarkup as Markup
+from redis.asyncio import Redis
 from sqlalchemy import and_, not_
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
+from ...bot.utils.audience import AudiencePruner
 from ...bot.utils.formatters import format_weekly_notify_to_message
 from ...bot.utils.messages import send_message
 from ...bot.utils.texts.buttons import TextButton, ButtonCode
 from ...bot.utils.texts.messages import TextMessage, MessageCode
-from ...config import BOUNTIES_CREATOR_BOT_URL
+from ...config import BOUNTIES_CREATOR_BOT_URL, Config
 from ...db.models import IssueDB, ChatDB
+from ...db.segments import Segments
 
 
 async def get_update_weekly_stats(sessionmaker: async_sessionmaker) -> Tuple[int, int, int]:
@@ -59,15 +62,17 @@ async def weekly_update_digest() -> None:
     """
     loop = asyncio.get_event_loop()
     bot: Bot = loop.__getattribute__("bot")
+    config: Config = loop.__getattribute__("config")
+    redis: Redis = loop.__getattribute__("redis")
     sessionmaker: async_sessionmaker = loop.__getattribute__("sessionmaker")
 
-    # Retrieve all chats ids
-    chats_ids: List[int, None] = await ChatDB.get_all_ids(sessionmaker)
     # Get statistics
     stats = await get_update_weekly_stats(sessionmaker)
 
     # Get message text and button
-    message_text = await TextMessage(sessionmaker).get(MessageCode.WEEKLY_DIGEST)
+    message_text, preview = await TextMessage(sessionmaker, config.bot.PREVIEW_PHOTOS).get_with_preview(
+        MessageCode.WEEKLY_DIGEST
+    )
     primary_button = await TextButton(sessionmaker).get_button(
         ButtonCode.CREATE_BOUNTY, url=BOUNTIES_CREATOR_BOT_URL
     )
@@ -76,6 +81,9 @@ async def weekly_update_digest() -> None:
     text = format_weekly_notify_to_message(message_text, stats)
     reply_markup = Markup(inline_keyboard=[[primary_button]])
 
-    # Send messages to all chats
-    for chat_id in chats_ids:
-        await send_message(bot, chat_id, text, reply_markup=reply_markup)
+    # Send messages to all chats as they are read, pruning the dead ones
+    pruner = AudiencePruner(sessionmaker, "weekly_digest", segments=Segments(redis))
+    async for chat_id in ChatDB.iter_all_ids(sessionmaker):
+        result = await send_message(bot, chat_id, text, reply_markup=reply_markup, preview=preview)
+        await pruner.track(chat_id, result)
+    await pruner.close()
@@ -0,0 +1,37 @@
+import time
+from typing import Dict
+
+from apscheduler.events import JobEvent, JobExecutionEvent, EVENT_JOB_SUBMITTED, EVENT_JOB_ERROR
+
+from . import tasks
+from ..monitoring.metrics import SCHEDULER_JOB_DURATION
+
+# Start times of the running jobs by job ID
+_started: Dict[str, float] = {}
+
+
+def get_job_name(job_id: str) -> str:
+    """
+    Get the name of the job for the metric labels.
+
+    :param job_id: The ID of the job.
+    :return: The ID of a periodic task, or "newsletter" for the newsletter jobs (with random IDs).
+    """
+    return job_id if job_id in tasks.__all__ else "newsletter"
+
+
+def on_job_event(event: JobEvent) -> None:
+    """
+    Records the duration of the jobs.
+
+    :param event: The job submission or execution event.
+    """
+    if event.code == EVENT_JOB_SUBMITTED:
+        _started[event.job_id] = time.monotonic()
+        return
+
+    started = _started.pop(event.job_id, None)
+    if started is None or not isinstance(event, JobExecutionEvent):
+        return
+    status = "error" if event.code == EVENT_JOB_ERROR else "ok"
+    SCHEDULER_JOB_DURATION.labels(get_job_name(event.job_id), status).observe(time.monotonic() - started)
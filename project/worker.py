@@ -0,0 +1,108 @@
+"""
+Worker process running the scheduled jobs, newsletter broadcasts and GitHub issue events.
+
+Run it with `python -m project.worker` and set APP_SCHEDULER_MODE=worker for the app,
+so that the web process only serves webhooks and the admin panel, and enqueues the work.
+"""
+import asyncio
+import signal
+
+from aiogram import Bot
+from aiogram.client.default import DefaultBotProperties
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.enums import ParseMode
+from prometheus_client import start_http_server
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sulguk import AiogramSulgukMiddleware
+
+from .admin.views.newsletter import NewsletterView
+from .apis.github import GitHubAPI
+from .bot.middlewares import RequestMetricsMiddleware
+from .config import load_config
+from .db.storage import configure_storage
+from .logger import setup_logger
+from .monitoring import LoopMonitor
+from .scheduler import RedisQueue, Scheduler, BROADCAST_QUEUE_KEY, ISSUE_EVENTS_QUEUE_KEY
+from .scheduler.tasks.track_and_notify import process_issue_event
+
+# Number of newsletters broadcast concurrently
+BROADCAST_DRAINERS = 1
+
+
+async def main() -> None:
+    """
+    Run the scheduler and the queue drainers until SIGINT or SIGTERM is received.
+
+    The metrics of the worker are served in the Prometheus text format on APP_WORKER_METRICS_PORT.
+    """
+    config = load_config()
+
+    githubapi = GitHubAPI(
+        token=config.github.TOKEN,
+        owner=config.github.OWNER,
+        repo=config.github.REPO,
+    )
+    # The worker has its own connection pool
+    engine = create_async_engine(
+        url=config.database.url(),
+        pool_pre_ping=True,
+    )
+    sessionmaker = async_sessionmaker(
+        bind=engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+    )
+    bot = Bot(
+        token=config.bot.TOKEN,
+        session=AiohttpSession(api=config.bot.api_server()),
+        default=DefaultBotProperties(
+            parse_mode=ParseMode.HTML,
+        )
+    )
+    bot.session.middleware(AiogramSulgukMiddleware())
+    bot.session.middleware(RequestMetricsMiddleware())
+    redis = Redis.from_url(config.redis.dsn())
+    scheduler = Scheduler(config=config)
+    broadcast_queue = RedisQueue(redis=redis, key=BROADCAST_QUEUE_KEY)
+    issue_events_queue = RedisQueue(redis=redis, key=ISSUE_EVENTS_QUEUE_KEY)
+
+    loop = asyncio.get_running_loop()
+    loop.__setattr__("bot", bot)
+    loop.__setattr__("config", config)
+    loop.__setattr__("githubapi", githubapi)
+    loop.__setattr__("redis", redis)
+    loop.__setattr__("sessionmaker", sessionmaker)
+
+    stop_event = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    loop_monitor = LoopMonitor()
+    loop_monitor.start()
+    start_http_server(config.app.WORKER_METRICS_PORT)
+
+    configure_storage()
+    scheduler.run()
+    broadcast_queue.start(NewsletterView.run_newsletter, drainers=BROADCAST_DRAINERS)
+    issue_events_queue.start(process_issue_event)
+
+    try:
+        await stop_event.wait()
+    finally:
+        # Cleanup actions
+        await scheduler.shutdown()
+        await broadcast_queue.stop()
+        await issue_events_queue.stop()
+        await redis.aclose()
+        await engine.dispose()
+        githubapi.close()
+        loop_monitor.stop()
+        await bot.session.close()
+
+
+if __name__ == '__main__':
+    # Set up logger
+    setup_logger()
+    # Run worker
+    asyncio.run(main())